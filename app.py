@@ -1,35 +1,65 @@
 import streamlit as st
-import pandas as pd
 import os
-import zipfile
-import re
-from employee_generator import generate_employee_data, PREDEFINED_FIELDS
-from gemini_resume import generate_resume_with_gemini
-from generate_pdf import save_resume_as_pdf
-from database import (init_db, register_user, get_user, save_feedback,
-                      get_all_feedback, save_generation_history, get_user_history)
+from database import (HISTORY_PAGE_SIZE, init_db, register_user, get_user, save_feedback, save_generation_history,
+                      get_feedback_page, get_user_history_page, flush_writes)
 from auth.hashing import hash_password, check_password
-from io import BytesIO
-import os, sys
+from exporters import EXPORT_FORMATS, EXPORT_MIME_TYPES, get_export, is_export_ready
+from telemetry import span, traced, snapshot, render_prometheus, reset as reset_metrics, start_metrics_server
 import base64
 import json
-from datetime import datetime
 
-
-print("\U0001F4C2 Current working directory:", os.getcwd())
-print("\U0001F4C1 Files in this directory:", os.listdir())
-print("\U0001F9E0 Python path:", sys.path)
+# pandas, Faker, the Gemini SDK and the PDF toolchain are imported inside the
+# pages that use them, so the login page doesn't pay for loading them.
 
 st.set_page_config(page_title="FakeHR", layout="wide")
 init_db()
+start_metrics_server()
+
+# Users who see the 📈 Metrics page, e.g. FAKEHR_ADMIN_USERS="alice,bob"
+ADMIN_USERS = {name.strip() for name in os.environ.get("FAKEHR_ADMIN_USERS", "").split(",") if name.strip()}
 
 if "user" not in st.session_state:
     st.session_state.user = None
 
+FEEDBACK_CACHE_TTL_SECONDS = 60
+
+
+# ------------------------
+# Cached Reads
+# ------------------------
+# Streamlit reruns this script on every interaction, so static assets (the
+# banner) are cached by (path, mtime, size) and feedback pages until new feedback
+# is submitted. Download artifacts (PDFs, ZIPs) are read when their button is
+# drawn and never cached: every cache hit would copy the whole file back out.
+
+STATIC_ASSET_CACHE_ENTRIES = 16
+
+def file_version(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+@st.cache_data(show_spinner=False, max_entries=STATIC_ASSET_CACHE_ENTRIES)
+def _read_static_asset_base64(path, version):
+    return base64.b64encode(read_file(path)).decode()
+
+
+def read_static_asset_base64(path):
+    return _read_static_asset_base64(path, file_version(path))
+
+
+def read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@st.cache_data(show_spinner=False, ttl=FEEDBACK_CACHE_TTL_SECONDS)
+def cached_feedback_page(before):
+    return get_feedback_page(before=before)
+
+
 def generate_download_link(file_path, link_text="Download PDF"):
-    with open(file_path, "rb") as f:
-        data = f.read()
-    b64 = base64.b64encode(data).decode()
+    b64 = base64.b64encode(read_file(file_path)).decode()
     href = f'<a href="data:application/octet-stream;base64,{b64}" download="{os.path.basename(file_path)}">{link_text}</a>'
     return href
 
@@ -37,8 +67,7 @@ def generate_download_link(file_path, link_text="Download PDF"):
 
 def display_banner_image(image_path, max_height="250px"):
 
-    with open(image_path, "rb") as img_file:
-        encoded = base64.b64encode(img_file.read()).decode()
+    encoded = read_static_asset_base64(image_path)
 
     st.markdown(
         f"""
@@ -52,6 +81,25 @@ def display_banner_image(image_path, max_height="250px"):
     )
 
 
+# Keyset pagination: session state keeps the stack of cursors for pages already visited
+
+def current_page(state_key, fetch_page):
+    cursors = st.session_state.setdefault(state_key, [None])
+    rows, next_cursor = fetch_page(cursors[-1])
+    return rows, next_cursor, len(cursors) - 1
+
+
+def page_navigation(state_key, next_cursor):
+    cursors = st.session_state[state_key]
+    col_newer, col_older = st.columns(2)
+    if len(cursors) > 1 and col_newer.button("⬅️ Newer", key=f"{state_key}_newer"):
+        cursors.pop()
+        st.rerun()
+    if next_cursor and col_older.button("Older ➡️", key=f"{state_key}_older"):
+        cursors.append(next_cursor)
+        st.rerun()
+
+
 # 👇 Call it in your app where you want the banner
 display_banner_image("static/banner.png")
 
@@ -122,7 +170,7 @@ def auth_section():
     st.markdown("---")
     st.subheader("💬 What Users Are Saying")
 
-    feedback = get_all_feedback()
+    feedback, next_cursor, _ = current_page("login_feedback_cursors", cached_feedback_page)
     if not feedback:
         st.info("No reviews yet. Be the first to leave feedback after using the app!")
     else:
@@ -131,24 +179,31 @@ def auth_section():
             st.markdown(f"💭 _{comment}_")
             st.caption(f"🕒 {created_at}")
             st.markdown("---")
+        page_navigation("login_feedback_cursors", next_cursor)
 
 
 def dashboard():
     st.sidebar.image("static/logo.png", width=150)
     st.sidebar.success(f"Logged in as {st.session_state.user['username']}")
 
-    option = st.sidebar.radio("Go to", [
-    "📊 Generate Data",
-    "📄 Generate Resumes",
-    "⭐ Rate Us",
-    "🕒 History",
-    "🚪 Logout"
-])
+    pages = [
+        "📊 Generate Data",
+        "📄 Generate Resumes",
+        "⭐ Rate Us",
+        "🕒 History",
+        "🚪 Logout"
+    ]
+    if st.session_state.user['username'] in ADMIN_USERS:
+        pages.insert(-1, "📈 Metrics")
+    option = st.sidebar.radio("Go to", pages)
 
     generate_clicked = False
 
     if option == "\U0001F4CA Generate Data":
         st.header("\U0001F4CA Fake Employee Data Generator")
+        from employee_generator import generate_employee_data, PREDEFINED_FIELDS
+        from artifact_store import save_dataset, dataset_digest, dataset_version
+
         num_rows = st.number_input("How many rows of data do you want?", 1, 1000, 10)
 
         field_options = list(PREDEFINED_FIELDS.keys())
@@ -158,43 +213,19 @@ def dashboard():
 
         if st.button("Generate Data"):
             generate_clicked = True
-            data = generate_employee_data(num_rows, selected_fields, custom_fields)
-            df = pd.DataFrame(data)
+            with span("ui.generate_data"):
+                df = generate_employee_data(num_rows, selected_fields, custom_fields)
             st.session_state.generated_data = df
             st.session_state.data_generated = True
 
-        if "generated_data" in st.session_state and st.session_state.generated_data is not None:
-            df = st.session_state.generated_data
-            st.dataframe(df)
-
-            csv = df.to_csv(index=False).encode()
-            json_data = df.to_json(orient="records").encode()
-            xlsx = BytesIO()
-            df.to_excel(xlsx, index=False, engine="openpyxl")
-            xlsx.seek(0)
-
-            st.download_button("⬇️ Download CSV", csv, "employee_data.csv")
-            st.download_button("⬇️ Download JSON", json_data, "employee_data.json")
-            st.download_button("⬇️ Download Excel", xlsx, "employee_data.xlsx")
-
-            # Save CSV & Excel to disk for history
-            os.makedirs("output/generated", exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-            csv_path = f"output/generated/data_{timestamp}.csv"
-            with open(csv_path, "wb") as f:
-                f.write(csv)
-
-            excel_path = f"output/generated/data_{timestamp}.xlsx"
-            with open(excel_path, "wb") as f:
-                f.write(xlsx.getbuffer())
-
-            # Save generation history
+            # Store the dataset once (deduplicated by content) and record it in history
+            with span("ui.save_dataset"):
+                dataset_path = save_dataset(df)
+            st.session_state.generated_data_version = dataset_version(dataset_path)
             history_details = {
                 "rows_generated": num_rows,
                 "fields": selected_fields + custom_fields,
-                "csv_path": csv_path,
-                "xlsx_path": excel_path
+                "dataset_path": dataset_path
             }
 
             save_generation_history(
@@ -203,6 +234,13 @@ def dashboard():
                 json.dumps(history_details)
             )
 
+        if "generated_data" in st.session_state and st.session_state.generated_data is not None:
+            df = st.session_state.generated_data
+            st.dataframe(df)
+
+            version = st.session_state.get("generated_data_version") or dataset_digest(df)
+            export_downloads(version, lambda: df, "generated_data", "employee_data")
+
     elif option == "\U0001F4C4 Generate Resumes":
         st.header("\U0001F4C4 Resume Generator")
         st.markdown("---")
@@ -217,10 +255,16 @@ def dashboard():
 
         if st.button("Submit Feedback"):
             save_feedback(st.session_state.user['id'], rating, comment)
+            # Make the new review visible on the next page load
+            flush_writes()
+            cached_feedback_page.clear()
             st.success("Thanks for your feedback!")
 
     elif option == "🕒 History":
         history_tab(st.session_state.user['username'])
+
+    elif option == "📈 Metrics":
+        metrics_tab()
     
     elif option == "Logout":
         st.session_state.pop("user", None)
@@ -230,27 +274,60 @@ def dashboard():
 
     st.markdown("---")
     st.subheader("\U0001F4E3 What Users Are Saying")
-    for username, rating, comment, created_at in get_all_feedback():
+    feedback, next_cursor, _ = current_page("dashboard_feedback_cursors", cached_feedback_page)
+    for username, rating, comment, created_at in feedback:
         st.markdown(f"**{username}** \u2b50 {rating}/5")
         st.markdown(f"_{comment}_ ({created_at})")
         st.markdown("---")
+    page_navigation("dashboard_feedback_cursors", next_cursor)
 
 
 
 
+def metrics_tab():
+    st.header("📈 Stage Timings")
+    st.caption("Per-stage durations recorded by this app process since it started (or since the last reset).")
+
+    rows = snapshot()
+    if not rows:
+        st.info("Nothing recorded yet. Generate some data or resumes first.")
+        return
+
+    st.dataframe([
+        {
+            "stage": row["stage"],
+            "labels": ", ".join(f"{key}={value}" for key, value in row["labels"].items()),
+            "count": row["count"],
+            "total (s)": round(row["total_s"], 3),
+            "mean (ms)": round(row["mean_s"] * 1000, 2),
+            "p50 (ms)": round(row["p50_s"] * 1000, 2),
+            "p95 (ms)": round(row["p95_s"] * 1000, 2),
+            "max (ms)": round(row["max_s"] * 1000, 2),
+        }
+        for row in rows
+    ])
+
+    metrics_text = render_prometheus()
+    st.download_button("⬇️ Download Prometheus metrics", metrics_text, "metrics.txt", mime="text/plain")
+    with st.expander("Prometheus text format"):
+        st.code(metrics_text, language="text")
+    if st.button("🔄 Reset timings"):
+        reset_metrics()
+        st.rerun()
+
+
 def history_tab(username):
     st.header("📜 Your Generation History")
 
-    history = get_user_history(username)
+    # Rows come back newest first, one page at a time
+    state_key = f"history_cursors_{username}"
+    history, next_cursor, page = current_page(state_key, lambda before: get_user_history_page(username, before=before))
 
     if not history:
         st.info("No history found yet. Start generating data or resumes.")
         return
 
-    # Sort by timestamp (latest first)
-    history = sorted(history, key=lambda x: x[2], reverse=True)
-
-    for idx, (data_type, details, timestamp) in enumerate(history, 1):
+    for idx, (data_type, details, timestamp) in enumerate(history, page * HISTORY_PAGE_SIZE + 1):
         icon = "📄" if data_type.lower() == "resume" else "📊"
 
         with st.expander(f"{icon} {idx}. {data_type} — {timestamp}"):
@@ -269,30 +346,74 @@ def history_tab(username):
                 for label, path in parsed.items():
                     if isinstance(path, str) and os.path.exists(path):
                         ext = os.path.splitext(path)[1].lower()
-                        if ext in [".csv", ".xlsx", ".zip"]:
-                            with open(path, "rb") as f:
-                                st.download_button(
-                                    label=f"⬇️ Download {ext.upper()[1:]}",
-                                    data=f.read(),
-                                    file_name=os.path.basename(path),
-                                    mime="application/zip" if ext == ".zip"
-                                         else "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet" if ext == ".xlsx"
-                                         else "text/csv",
-                                    key=f"{idx}_{label}"
-                                )
+                        if ext in [".csv", ".xlsx", ".zip", ".pdf"]:
+                            st.download_button(
+                                label=f"⬇️ Download {ext.upper()[1:]}",
+                                data=read_file(path),
+                                file_name=os.path.basename(path),
+                                mime="application/zip" if ext == ".zip"
+                                     else "application/pdf" if ext == ".pdf"
+                                     else "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet" if ext == ".xlsx"
+                                     else "text/csv",
+                                key=f"{idx}_{label}"
+                            )
+                        elif ext == ".parquet":
+                            from artifact_store import load_dataset, dataset_version
+
+                            export_downloads(
+                                dataset_version(path),
+                                lambda path=path: load_dataset(path),
+                                f"{idx}_{label}",
+                                "employee_data",
+                                formats=("csv", "xlsx")
+                            )
 
             except json.JSONDecodeError:
                 st.warning("⚠️ Could not parse saved details. Showing raw content:")
                 st.markdown(details)
 
+    page_navigation(state_key, next_cursor)
 
 
+def export_downloads(version, load_df, key, file_name, formats=EXPORT_FORMATS, sheet_name="Sheet1"):
+    # Each format is encoded once per dataset version, and only when someone asks for it
+    for file_format in formats:
+        if is_export_ready(version, file_format):
+            st.download_button(
+                label=f"⬇️ Download {file_format.upper()}",
+                data=get_export(version, file_format, load_df, sheet_name),
+                file_name=f"{file_name}.{file_format}",
+                mime=EXPORT_MIME_TYPES[file_format],
+                key=f"{key}_{file_format}"
+            )
+        elif st.button(f"📦 Prepare {file_format.upper()}", key=f"{key}_{file_format}_prepare"):
+            get_export(version, file_format, load_df, sheet_name)
+            st.rerun()
+
+
+@traced("ui.resume_generator")
 def resume_generator_ui():    
     st.subheader("📿 Bulk Resume Generator")
+    from resume_jobs import get_runner, latest_job_id, submit_resume_job
+
+    # Resumes are generated by background workers (see resume_jobs.py); this page
+    # queues a job and shows its progress, so reruns and refreshes don't restart it
+    get_runner()
+    username = st.session_state.user['username']
 
     if "data_generated" not in st.session_state or not st.session_state.data_generated:
         st.warning("⚠️ Please generate employee data first in the 'Generate Data' section.")
-        return
+    else:
+        resume_job_form(username, submit_resume_job)
+
+    job_id = st.session_state.get("resume_job_id") or latest_job_id(username)
+    if job_id:
+        st.markdown("---")
+        resume_job_view(job_id)
+
+
+def resume_job_form(username, submit_resume_job):
+    from gemini_resume import select_resume_fields, resume_prompt_fields
 
     df = st.session_state.generated_data.copy()
     df.columns = [col.strip().lower() for col in df.columns]
@@ -301,75 +422,84 @@ def resume_generator_ui():
         st.error("❌ 'name' column is required to generate resumes.")
         return
 
-    resume_fields = [col for col in df.columns if col != "resume"]
-
-    default_resume_fields = ["name"]
-    for field in ["job_title", "skills", "experience"]:
-        if field in df.columns:
-            default_resume_fields.append(field)
-
-    optional_fields = [
-        "education", "location", "email", "phone", 
-        "linkedin", "github", "certifications"
-    ]
-    available_optional_fields = [f for f in optional_fields if f in df.columns and f not in default_resume_fields]
+    # Unchanged rows reuse the previous job's resumes and PDFs, so edits only regenerate what they touch
+    with st.expander("✏️ Edit rows before generating"):
+        df = st.data_editor(df, key="resume_rows_editor", num_rows="fixed")
 
     # Hidden field selection (not shown to user)
-    selected_fields = default_resume_fields + available_optional_fields
-
-    if "name" not in selected_fields:
-        st.warning("⚠️ 'name' must be included to generate resumes.")
-        return
-
-    resume_dir = "output/resumes"
-    os.makedirs(resume_dir, exist_ok=True)
-    resume_files = []
-
-    st.markdown("### 👁️ Resume Previews")
+    selected_fields = select_resume_fields(df.columns)
 
+    candidates = []
     for index, row in df.iterrows():
         employee_data = row.to_dict()
         if not employee_data.get("name"):
             continue
 
         # Create prompt fields for Gemini
-        prompt_fields = {}
-        for key in selected_fields:
-            display_key = "Job Title" if key == "job_title" else key
-            prompt_fields[display_key] = employee_data.get(key, "")
-
-        # Fallback to 'job_profiles' if 'job_title' is missing
-        if "Job Title" not in prompt_fields or not prompt_fields["Job Title"]:
-            if "job_profiles" in df.columns:
-                prompt_fields["Job Title"] = employee_data.get("job_profiles", "")
-
-        # Generate realistic resume data (JSON)
-        with st.spinner(f"⏳ Generating resume for {employee_data['name']}..."):
-            st.write("🚀 Sending request to Gemini API...")
-            try:
-                resume_data = generate_resume_with_gemini(prompt_fields)
-                st.write("✅ Gemini API response received")
+        candidates.append((index, employee_data, resume_prompt_fields(employee_data, selected_fields)))
+
+    combine_pdf = st.checkbox("📚 Also create one combined PDF (one page per candidate)")
+    if st.button(f"🚀 Generate {len(candidates)} resumes"):
+        st.session_state.resume_job_id = submit_resume_job(username, candidates, combine_pdf=combine_pdf)
+        st.rerun()
+
+
+def resume_job_view(job_id):
+    from resume_jobs import get_job, JOB_DONE
+
+    job = get_job(job_id)
+    if job is None:
+        return
+    if job["status"] != JOB_DONE:
+        resume_job_progress(job_id)
+        return
+    resume_job_results(job)
+
 
-                contact = " | ".join(filter(None, [
-                    employee_data.get("email", ""),
-                    employee_data.get("phone", ""),
-                    employee_data.get("linkedin", "")
-                ]))
+@st.fragment(run_every=2)
+def resume_job_progress(job_id):
+    from resume_jobs import get_job, JOB_DONE
 
-                pdf_path = save_resume_as_pdf(employee_data["name"], {
-                    **resume_data,
-                    "title": prompt_fields.get("Job Title", ""),
-                    "contact": contact
-                })
+    job = get_job(job_id)
+    if job["status"] == JOB_DONE:
+        st.rerun()  # full rerun to show the results
 
-            except Exception as e:
-                st.error(f"❌ Error generating resume for {employee_data['name']}: {e}")
-                df.at[index, "resume"] = "❌ Failed"
-                continue
+    counts = job["counts"]
+    finished = counts["done"] + counts["failed"]
+    st.markdown(f"### ⏳ Job #{job_id} — started {job['created_at']}")
+    st.progress(finished / max(1, job["total"]), text=f"⏳ {finished}/{job['total']} resumes generated")
+    reuse_caption(job)
+    if counts["failed"]:
+        st.caption(f"❌ {counts['failed']} failed")
+    if finished == job["total"]:
+        st.caption("📦 Packaging resumes...")
 
 
+def reuse_caption(job):
+    reused, rerendered = job["options"].get("reused", 0), job["options"].get("rerendered", 0)
+    if reused or rerendered:
+        st.caption(f"♻️ {reused} unchanged resumes reused, {rerendered} re-rendered without calling Gemini")
+
+
+def resume_job_results(job):
+    import pandas as pd
+    from resume_jobs import get_job_tasks, DONE
+
+    tasks = get_job_tasks(job["id"])
+    st.markdown(f"### 👁️ Resume Previews — job #{job['id']}")
+    reuse_caption(job)
+
+    table = []
+    for task in tasks:
+        resume_data, pdf_path = task["resume"], task["pdf_path"]
+        row = {**task["row"], "resume": "❌ Failed"}
+        table.append(row)
+        if task["status"] != DONE:
+            st.error(f"❌ Error generating resume for {task['name']}: {task['error']}")
+            continue
+
         # Add preview section
-        with st.expander(f"📄 Preview: {employee_data['name']}"):
+        with st.expander(f"📄 Preview: {task['name']}"):
             st.markdown(f"**Summary**: {resume_data.get('summary', '')}")
             st.markdown("**Experience:**")
             for exp in resume_data.get("experience", []):
@@ -387,74 +517,39 @@ def resume_generator_ui():
 
             # Add download button for individual resume
             if pdf_path and os.path.exists(pdf_path):
-                with open(pdf_path, "rb") as f:
-                    pdf_bytes = f.read()
-                download_label = f"📄 Download {employee_data['name']}'s Resume"
                 st.download_button(
-                    label=download_label,
-                    data=pdf_bytes,
+                    label=f"📄 Download {task['name']}'s Resume",
+                    data=read_file(pdf_path),
                     file_name=os.path.basename(pdf_path),
                     mime="application/pdf",
-                    key=f"download_{index}"
+                    key=f"download_{job['id']}_{task['position']}"
                 )
-                df.at[index, "resume"] = os.path.basename(pdf_path)  # ✅ Just the filename
-
-                resume_files.append(pdf_path)
+                row["resume"] = os.path.basename(pdf_path)  # ✅ Just the filename
             else:
-                st.error(f"❌ PDF not found for {employee_data['name']}")
-                df.at[index, "resume"] = "❌ Failed"
+                st.error(f"❌ PDF not found for {task['name']}")
 
-    if not resume_files:
+    if not any(row["resume"] != "❌ Failed" for row in table):
         st.warning("⚠️ No valid resumes were generated. Make sure selected fields have valid data.")
         return
 
+    df = pd.DataFrame(table)
     st.success("✅ Resumes generated successfully!")
     st.markdown("### 📅 Downloadable Resume Table")
     st.dataframe(df)
 
     st.markdown("### ⬇️ Download All Data")
 
-    # CSV / JSON / Excel exports
-    csv = df.to_csv(index=False).encode('utf-8')
-    json_data = df.to_json(orient="records").encode('utf-8')
-    excel_io = BytesIO()
-    df.to_excel(excel_io, index=False, sheet_name="Resumes")
-    excel_io.seek(0)
-
-    st.download_button("📄 Download CSV", data=csv, file_name="employees.csv", mime="text/csv")
-    st.download_button("🦾 Download JSON", data=json_data, file_name="employees.json", mime="application/json")
-    st.download_button("📈 Download Excel", data=excel_io, file_name="employees.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-
-    # Zip all resumes
-    zip_buffer = BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w") as zipf:
-        for file_path in resume_files:
-            arcname = os.path.basename(file_path)
-            zipf.write(file_path, arcname=arcname)
-    zip_buffer.seek(0)
-
-    # Save ZIP to disk
-    os.makedirs("output/zips", exist_ok=True)
-    zip_path = "output/zips/all_resumes.zip"
-    with open(zip_path, "wb") as f:
-        f.write(zip_buffer.getvalue())
-
-    # Download button
-    st.download_button("📦 Download All Resumes (ZIP)", data=zip_buffer, file_name="all_resumes.zip", mime="application/zip")
-
-    # Save history with structured details
-    names = df['name'].tolist()
-    history_details = {
-        "count": len(resume_files),
-        "names": names,
-        "zip_path": zip_path
-    }
-
-    save_generation_history(
-        st.session_state.user['username'],
-        "Resume",
-        json.dumps(history_details)
-    )
+    # CSV / JSON / Excel exports, encoded on request; a finished job never changes
+    export_downloads(f"resume_job_{job['id']}", lambda: df, f"resume_data_{job['id']}", "employees",
+                     sheet_name="Resumes")
+
+    if job["zip_path"] and os.path.exists(job["zip_path"]):
+        st.download_button("📦 Download All Resumes (ZIP)", data=read_file(job["zip_path"]),
+                           file_name="all_resumes.zip", mime="application/zip")
+
+    if job["combined_pdf_path"] and os.path.exists(job["combined_pdf_path"]):
+        st.download_button("📚 Download Combined PDF", data=read_file(job["combined_pdf_path"]),
+                           file_name="all_resumes.pdf", mime="application/pdf")
 
     st.session_state.generated_resume_data = df.copy()
 
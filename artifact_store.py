@@ -0,0 +1,52 @@
+import hashlib
+import os
+
+import pandas as pd
+
+from exporters import get_export
+
+# ------------------------
+# Dataset Artifact Store
+# ------------------------
+# Generated datasets are written once as compressed Parquet, named by a hash of
+# their content, so regenerating identical data reuses the existing file.
+# CSV / Excel / JSON copies are only encoded when someone downloads them.
+
+ARTIFACT_DIR = os.path.join("output", "artifacts")
+PARQUET_COMPRESSION = "zstd"
+
+def dataset_digest(df):
+    digest = hashlib.sha256()
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def dataset_path(digest):
+    return os.path.join(ARTIFACT_DIR, digest[:2], f"{digest}.parquet")
+
+
+def save_dataset(df):
+    """Store df once and return its path; identical content maps to the same file."""
+    path = dataset_path(dataset_digest(df))
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path, engine="pyarrow", compression=PARQUET_COMPRESSION, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_dataset(path):
+    return pd.read_parquet(path, engine="pyarrow")
+
+
+def dataset_version(path):
+    # The file name is the content digest, so it doubles as a cache key for exports
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def export_dataset(path, file_format):
+    return get_export(dataset_version(path), file_format, lambda: load_dataset(path))
@@ -0,0 +1,94 @@
+"""Import-time benchmark: cold-start cost of the app's login page and of each module.
+
+Every measurement runs in a fresh interpreter with streamlit already imported, since the
+Streamlit server has loaded it before app.py runs.
+
+    python benchmarks/import_time.py [--repeat 5] [--json import_time.json]
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PRELOADED = "streamlit"
+
+MODULES = [
+    "database",
+    "exporters",
+    "artifact_store",
+    "data_sinks",
+    "value_pools",
+    "employee_generator",
+    "resume_cache",
+    "gemini_resume",
+    "pdf_native",
+    "generate_pdf",
+]
+
+# Dependencies the login page should not load
+HEAVY_MODULES = ["pandas", "numpy", "faker", "google.generativeai", "pdfkit", "jinja2", "pyarrow", "openpyxl"]
+
+_PROBE = """
+import json, sys, time, warnings
+warnings.simplefilter("ignore")
+import {preloaded}
+before = set(sys.modules)
+start = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - start
+loaded = [name for name in {heavy!r} if name in sys.modules and name not in before]
+print(json.dumps({{"seconds": elapsed, "heavy": loaded}}))
+"""
+
+
+def app_imports(path=os.path.join(ROOT, "app.py")):
+    """The import statements app.py runs at module level, i.e. before the login page renders."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def measure(imports, repeat):
+    probe = _PROBE.format(preloaded=PRELOADED, imports=imports, heavy=HEAVY_MODULES)
+    timings, heavy = [], []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        timings.append(result["seconds"])
+        heavy = result["heavy"]
+    return {"median_ms": round(statistics.median(timings) * 1000, 1),
+            "min_ms": round(min(timings) * 1000, 1),
+            "heavy_modules": heavy}
+
+
+def run(repeat=5):
+    results = {"app (login page)": measure(app_imports(), repeat)}
+    for module in MODULES:
+        results[module] = measure(f"import {module}", repeat)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    width = max(len(name) for name in results)
+    for name, result in results.items():
+        heavy = ", ".join(result["heavy_modules"]) or "-"
+        print(f"{name:<{width}}  {result['median_ms']:>8.1f} ms  (min {result['min_ms']:.1f})  heavy: {heavy}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
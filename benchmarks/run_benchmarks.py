@@ -0,0 +1,404 @@
+"""Benchmark suite for the generation, rendering, export and persistence hot paths.
+
+Results are written as JSON and compared with a stored baseline; any case whose median
+is slower than the baseline by more than the threshold fails the run (exit code 1).
+Gemini is replaced by a local stub, and every file the cases write goes to a temp dir.
+
+    python benchmarks/run_benchmarks.py                      # run, compare with baseline.json
+    python benchmarks/run_benchmarks.py --quick -k generate  # fewer repeats, matching cases only, not gated
+    python benchmarks/run_benchmarks.py --save-baseline      # record a new baseline
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+# Differences below this are timer noise, whatever the ratio
+ABSOLUTE_TOLERANCE_SECONDS = 0.002
+# Cases this short swing by 10+ ms between runs on a busy machine (scheduler, page
+# cache), so they only count as regressed past a larger absolute slowdown
+SHORT_CASE_SECONDS = 0.05
+SHORT_CASE_TOLERANCE_SECONDS = 0.02
+
+SEED = 1234
+
+CASES = {}
+
+
+def case(name, items=1, repeat=5):
+    """Register setup(workdir) -> fn; fn() is the timed call, items the work done per call."""
+    def register(setup):
+        CASES[name] = {"setup": setup, "items": items, "repeat": repeat}
+        return setup
+    return register
+
+
+# ------------------------
+# Stubs and Fixtures
+# ------------------------
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubGeminiModel:
+    """Answers resume prompts locally with a fixed, schema-valid resume."""
+
+    model_name = "stub-gemini"
+
+    def __init__(self, latency_seconds=0.0):
+        self.latency_seconds = latency_seconds
+
+    def resume(self):
+        return {
+            "summary": "Experienced professional with a record of delivering results.",
+            "experience": ["Led a team of five engineers", "Cut infrastructure cost by 20%"],
+            "education": "B.Sc Computer Science, State University, 2015",
+            "certifications": "",
+            "skills": ["Python", "SQL", "Leadership", "Communication", "Planning"],
+            "languages": ["English - Native", "Spanish - Fluent"],
+            "projects": ["Data platform migration", "Customer analytics dashboard"],
+            "awards": ["Employee of the Year"],
+        }
+
+    def generate_content(self, prompt):
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        match = re.search(r"### Candidates:\n(.*?)\n\n### Output", prompt, re.S)
+        if match:
+            candidates = json.loads(match.group(1))
+            return StubResponse(json.dumps([{"id": c["id"], **self.resume()} for c in candidates]))
+        return StubResponse(json.dumps(self.resume()))
+
+
+def sample_frame(rows, fields=None):
+    from employee_generator import PREDEFINED_FIELDS, generate_employee_data
+
+    return generate_employee_data(rows, fields or list(PREDEFINED_FIELDS), ["department", "salary band"], seed=SEED)
+
+
+def sample_resumes(count):
+    import gemini_resume
+
+    random.seed(SEED)
+    gemini_resume._get_faker().seed_instance(SEED)
+    return [(f"Candidate {index}", gemini_resume.generate_fallback_resume(f"Candidate {index}"))
+            for index in range(count)]
+
+
+# ------------------------
+# Data Generation
+# ------------------------
+
+FIELD_MIXES = {
+    "core": ["name", "email", "phone", "country"],
+    "all": None,
+}
+
+for _rows in (1_000, 10_000):
+    for _mix, _fields in FIELD_MIXES.items():
+        def _setup(workdir, rows=_rows, fields=_fields):
+            from employee_generator import PREDEFINED_FIELDS, generate_employee_data
+
+            selected = fields or list(PREDEFINED_FIELDS)
+            return lambda: generate_employee_data(rows, selected, ["department"], seed=SEED)
+
+        case(f"generate.{_mix}.{_rows}", items=_rows, repeat=3)(_setup)
+
+
+@case("generate.pooled.all.50000", items=50_000, repeat=3)
+def _generate_pooled(workdir):
+    import value_pools
+    from employee_generator import PREDEFINED_FIELDS, generate_employee_data
+
+    value_pools.POOL_CACHE_DIR = os.path.join(workdir, "pools")
+    run = lambda: generate_employee_data(50_000, list(PREDEFINED_FIELDS), [], seed=SEED, pool_uniqueness=0.2)
+    run()  # build and cache the pools outside the timed calls
+    return run
+
+
+@case("detect_country_from_name", items=10_000)
+def _detect_country(workdir):
+    from employee_generator import detect_country_from_name
+
+    names = list(sample_frame(10_000, ["name"])["name"])
+    return lambda: [detect_country_from_name(name) for name in names]
+
+
+@case("detect_countries_from_names", items=10_000)
+def _detect_countries(workdir):
+    from employee_generator import detect_countries_from_names
+
+    names = sample_frame(10_000, ["name"])["name"]
+    return lambda: detect_countries_from_names(names)
+
+
+@case("generate_fake_value_for_custom_field", items=10_000)
+def _custom_field(workdir):
+    from employee_generator import generate_fake_value_for_custom_field
+
+    names = ["salary", "department", "start date", "employee id", "manager email", "city", "team notes"] * 1_429
+    names = names[:10_000]
+    return lambda: [generate_fake_value_for_custom_field(name) for name in names]
+
+
+# ------------------------
+# Resumes
+# ------------------------
+
+@case("resumes.batch.stub_llm", items=200)
+def _resumes_batch(workdir):
+    from gemini_resume import generate_resumes_batch
+
+    fields_list = [{"name": f"Candidate {index}", "Job Title": "Engineer"} for index in range(200)]
+    model = StubGeminiModel()
+    return lambda: generate_resumes_batch(fields_list, model=model, requests_per_minute=10 ** 9, cache=False)
+
+
+@case("save_resume_as_pdf.native", items=50)
+def _pdf_native(workdir):
+    from generate_pdf import save_resume_as_pdf
+
+    resumes = sample_resumes(50)
+    directory = os.path.join(workdir, "resumes")
+    return lambda: [save_resume_as_pdf(name, data, directory, backend="native") for name, data in resumes]
+
+
+@case("save_resume_as_pdf.wkhtmltopdf", items=10, repeat=3)
+def _pdf_wkhtmltopdf(workdir):
+    from generate_pdf import get_pdf_backend, save_resume_as_pdf
+
+    if not get_pdf_backend("wkhtmltopdf").is_available():
+        return None  # skipped where the binary isn't installed
+    resumes = sample_resumes(10)
+    directory = os.path.join(workdir, "resumes")
+    return lambda: [save_resume_as_pdf(name, data, directory, backend="wkhtmltopdf") for name, data in resumes]
+
+
+@case("save_resumes_as_pdfs.native.zip", items=200, repeat=3)
+def _pdf_pool(workdir):
+    from generate_pdf import save_resumes_as_pdfs
+
+    resumes = sample_resumes(200)
+    directory = os.path.join(workdir, "pool")
+    zip_path = os.path.join(workdir, "all_resumes.zip")
+    return lambda: save_resumes_as_pdfs(resumes, directory, zip_path=zip_path, backend="native")
+
+
+# ------------------------
+# Exports
+# ------------------------
+
+for _format in ("csv", "json", "xlsx"):
+    def _setup(workdir, file_format=_format):
+        from exporters import encode_dataframe
+
+        df = sample_frame(5_000)
+        return lambda: encode_dataframe(df, file_format)
+
+    case(f"export.{_format}.5000", items=5_000, repeat=3)(_setup)
+
+
+# ------------------------
+# Database
+# ------------------------
+
+def _use_temp_database(workdir):
+    import database
+
+    database.flush_writes()
+    database.DB_FILE = os.path.join(workdir, "bench.db")
+    database.init_db()
+    return database
+
+
+@case("database.write_history", items=2_000)
+def _db_write(workdir):
+    database = _use_temp_database(workdir)
+
+    def run():
+        for index in range(2_000):
+            database.save_generation_history("bench", "Fake Data", json.dumps({"rows_generated": index}))
+        database.flush_writes()
+    return run
+
+
+@case("database.read_history_page", items=100, repeat=15)
+def _db_read_history(workdir):
+    database = _use_temp_database(workdir)
+    for index in range(20_000):
+        database.save_generation_history(f"user{index % 10}", "Fake Data", json.dumps({"rows_generated": index}))
+    database.flush_writes()
+
+    def run():
+        cursor = None
+        for _ in range(100):
+            _, cursor = database.get_user_history_page("user3", before=cursor)
+    return run
+
+
+@case("database.read_feedback_page", items=100, repeat=15)
+def _db_read_feedback(workdir):
+    database = _use_temp_database(workdir)
+    for index in range(5_000):
+        database.save_feedback(f"user{index % 50}", index % 5 + 1, "Great tool")
+    database.flush_writes()
+
+    def run():
+        cursor = None
+        for _ in range(100):
+            _, cursor = database.get_feedback_page(before=cursor)
+    return run
+
+
+# ------------------------
+# Startup
+# ------------------------
+
+@case("import.app_login_page", repeat=1)
+def _import_app(workdir):
+    from import_time import app_imports, measure
+
+    # Each call already spawns and times fresh interpreters; report their median
+    return lambda: measure(app_imports(), repeat=5)["median_ms"] / 1000
+
+
+# ------------------------
+# Runner
+# ------------------------
+
+def run_case(name, spec, workdir, repeat_scale=1.0):
+    fn = spec["setup"](workdir)
+    if fn is None:
+        return None
+    repeat = max(1, int(round(spec["repeat"] * repeat_scale)))
+
+    timings = []
+    if name.startswith("import."):
+        timings = [fn() for _ in range(repeat)]
+    else:
+        fn()  # warm-up: imports, compiled regexes and templates, pools
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    return {
+        "median_s": round(median, 6),
+        "min_s": round(min(timings), 6),
+        "repeat": repeat,
+        "items": spec["items"],
+        "items_per_s": round(spec["items"] / median, 1) if median else None,
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return [(case, baseline_s, current_s, ratio)] for every case slower than allowed.
+
+    Cases measured with fewer repeats than their baseline (e.g. --quick) are too noisy to gate on and are skipped.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous or result["repeat"] < previous.get("repeat", 1):
+            continue
+        before, after = previous["median_s"], result["median_s"]
+        tolerance = SHORT_CASE_TOLERANCE_SECONDS if before < SHORT_CASE_SECONDS else ABSOLUTE_TOLERANCE_SECONDS
+        if after > before * (1 + threshold) and after - before > tolerance:
+            regressions.append((name, before, after, after / before))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", help="only run cases whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="a third of the repeats, for local iteration")
+    parser.add_argument("--output", "-o", help="write the results JSON here")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a case counts as a regression (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    args = parser.parse_args(argv)
+    if args.quick and args.save_baseline:
+        parser.error("--save-baseline needs full repeats; drop --quick")
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="fakehr_bench_") as workdir:
+        for name, spec in CASES.items():
+            if args.pattern and args.pattern not in name:
+                continue
+            result = run_case(name, spec, workdir, 1 / 3 if args.quick else 1.0)
+            if result is None:
+                print(f"{name:<40} skipped", file=sys.stderr)
+                continue
+            results[name] = result
+            print(f"{name:<40} {result['median_s'] * 1000:>10.2f} ms  {result['items_per_s'] or 0:>12,.0f}/s",
+                  file=sys.stderr)
+        import database
+        database.flush_writes()
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        previous = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                previous = json.load(f)["results"]
+        report["results"] = {**previous, **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline first.", file=sys.stderr)
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    if args.quick:
+        print("Quick run: not compared with the baseline (run without --quick to gate).", file=sys.stderr)
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, before, after, ratio in regressions:
+        print(f"REGRESSION {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms ({ratio:.2f}x)", file=sys.stderr)
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} of the baseline.", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
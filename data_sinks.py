@@ -0,0 +1,76 @@
+import os
+
+# ------------------------
+# Chunk Sinks
+# ------------------------
+# Each sink appends DataFrame chunks to one file on disk, so only the current
+# chunk is ever held in memory.
+
+def _prepare(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+def write_csv(chunks, path):
+    _prepare(path)
+    rows = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        for chunk in chunks:
+            chunk.to_csv(f, index=False, header=rows == 0)
+            rows += len(chunk)
+    return rows
+
+
+def write_jsonl(chunks, path):
+    _prepare(path)
+    rows = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            if len(chunk):
+                text = chunk.to_json(orient="records", lines=True, force_ascii=False)
+                f.write(text if text.endswith("\n") else text + "\n")
+            rows += len(chunk)
+    return rows
+
+
+def write_parquet(chunks, path):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet output requires pyarrow (pip install pyarrow).") from e
+
+    _prepare(path)
+    rows = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression="snappy")
+            else:
+                table = table.cast(writer.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+SINKS = {
+    "csv": write_csv,
+    "jsonl": write_jsonl,
+    "parquet": write_parquet,
+}
+
+
+def write_chunks(chunks, path, file_format=None):
+    """Stream DataFrame chunks into path; the format defaults to the file extension."""
+    file_format = (file_format or os.path.splitext(path)[1].lstrip(".")).lower()
+    if file_format == "json":
+        file_format = "jsonl"
+    if file_format not in SINKS:
+        raise ValueError(f"Unsupported output format: {file_format}")
+    return SINKS[file_format](chunks, path)
@@ -1,15 +1,105 @@
+import atexit
+import itertools
+import logging
+import queue
 import sqlite3
-from datetime import datetime
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
 import bcrypt
+from telemetry import span
+
+logger = logging.getLogger(__name__)
 
 DB_FILE = "fakehr.db"
 
+HISTORY_PAGE_SIZE = 20
+FEEDBACK_PAGE_SIZE = 10
 
+# ------------------------
+# Connection Pool
+# ------------------------
+# Connections are opened once and handed out per call instead of connecting on
+# every query. Reusing a connection also reuses sqlite3's prepared-statement cache.
 
-def init_db():
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
+POOL_SIZE = 8
+BUSY_TIMEOUT_SECONDS = 30
+CACHED_STATEMENTS = 256
+
+PRAGMAS = [
+    "PRAGMA journal_mode=WAL",      # readers no longer block the writer
+    "PRAGMA synchronous=NORMAL",    # safe with WAL, one fsync per checkpoint instead of per commit
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",      # 8 MB page cache per connection
+]
+
+
+class ConnectionPool:
+    def __init__(self, db_file, size=POOL_SIZE):
+        self.db_file = db_file
+        self.size = size
+        self._idle = queue.LifoQueue()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_file, timeout=BUSY_TIMEOUT_SECONDS,
+                               cached_statements=CACHED_STATEMENTS, check_same_thread=False)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._idle.qsize() < self.size:
+                self._idle.put(conn)
+            else:
+                conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
 
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        # DB_FILE may be pointed elsewhere at runtime (e.g. benchmarks)
+        if _pool is None or _pool.db_file != DB_FILE:
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(DB_FILE)
+        return _pool
+
+
+@contextmanager
+def get_connection():
+    with _get_pool().connection() as conn:
+        yield conn
+
+
+# ------------------------
+# Schema Migrations
+# ------------------------
+# Each migration runs once, in order, and bumps PRAGMA user_version in the same
+# transaction. Migrations must stay idempotent so databases created before
+# versioning (user_version 0, tables already present) upgrade cleanly.
+
+def _create_base_tables(c):
     # User table
     c.execute('''CREATE TABLE IF NOT EXISTS users (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -25,14 +115,6 @@ def init_db():
         comment TEXT
     )''')
 
-     # Try to add 'created_at' column (only if it doesn't exist)
-    try:
-        c.execute("ALTER TABLE feedback ADD COLUMN created_at TEXT")
-        c.execute("UPDATE feedback SET created_at = datetime('now') WHERE created_at IS NULL")
-    except sqlite3.OperationalError as e:
-        if "duplicate column name" not in str(e).lower():
-            raise  # only ignore if it's already added
-
     # Generation history table
     c.execute('''CREATE TABLE IF NOT EXISTS history (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -42,62 +124,275 @@ def init_db():
         timestamp TEXT
     )''')
 
-    conn.commit()
-    conn.close()
+
+def _add_feedback_created_at(c):
+    if add_column_if_missing(c, "feedback", "created_at", "TEXT"):
+        c.execute("UPDATE feedback SET created_at = datetime('now') WHERE created_at IS NULL")
+
+
+def _add_listing_indexes(c):
+    # Composite indexes backing the ORDER BY ... DESC keyset queries below
+    c.execute("CREATE INDEX IF NOT EXISTS idx_history_username_timestamp ON history (username, timestamp, id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_feedback_created_at ON feedback (created_at, id)")
+
+
+def _create_resume_job_tables(c):
+    # Bulk resume jobs (see resume_jobs.py): one row per job, one task row per candidate
+    c.execute('''CREATE TABLE IF NOT EXISTS resume_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT,
+        status TEXT,
+        total INTEGER,
+        options TEXT,
+        zip_path TEXT,
+        combined_pdf_path TEXT,
+        claimed_at REAL,
+        created_at TEXT,
+        finished_at TEXT
+    )''')
+    c.execute('''CREATE TABLE IF NOT EXISTS resume_tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_id INTEGER,
+        position INTEGER,
+        name TEXT,
+        row_data TEXT,
+        prompt_fields TEXT,
+        status TEXT,
+        attempts INTEGER DEFAULT 0,
+        claimed_by TEXT,
+        claimed_at REAL,
+        resume TEXT,
+        pdf_path TEXT,
+        error TEXT
+    )''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_resume_tasks_status ON resume_tasks (status, job_id, position)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_resume_tasks_job ON resume_tasks (job_id, position)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_resume_jobs_username ON resume_jobs (username, id)")
+
+
+def _add_resume_task_fingerprints(c):
+    # Inputs of a finished task's resume (prompt fields + model) and of its PDF (resume + layout)
+    add_column_if_missing(c, "resume_tasks", "resume_fingerprint", "TEXT")
+    add_column_if_missing(c, "resume_tasks", "render_fingerprint", "TEXT")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_resume_tasks_fingerprint ON resume_tasks (resume_fingerprint, status)")
+
+
+MIGRATIONS = [
+    (1, _create_base_tables),
+    (2, _add_feedback_created_at),
+    (3, _add_listing_indexes),
+    (4, _create_resume_job_tables),
+    (5, _add_resume_task_fingerprints),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# DB file whose schema is known to be current in this process
+_migrated_db_file = None
+
+
+def add_column_if_missing(c, table, column, declaration):
+    columns = {row[1] for row in c.execute(f"PRAGMA table_info({table})")}
+    if column in columns:
+        return False
+    c.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+    return True
+
+
+def get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    if get_schema_version(conn) >= SCHEMA_VERSION:
+        return
+
+    c = conn.cursor()
+    for version, migration in MIGRATIONS:
+        # BEGIN IMMEDIATE takes the write lock, so concurrent processes apply each step once
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            if get_schema_version(conn) < version:
+                migration(c)
+                c.execute(f"PRAGMA user_version = {version:d}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+def init_db():
+    # A single version check per process; nothing is written once the schema is current
+    global _migrated_db_file
+    if _migrated_db_file == DB_FILE:
+        return
+    with get_connection() as conn:
+        migrate(conn)
+    _migrated_db_file = DB_FILE
+
+
+# ------------------------
+# Write-behind Queue
+# ------------------------
+# History and feedback inserts are queued and committed by one background thread
+# in grouped transactions. The queue is bounded: when it is full, submit() blocks
+# the caller until the writer catches up.
+
+WRITE_QUEUE_SIZE = 10_000
+WRITE_BATCH_SIZE = 500
+WRITE_BATCH_WAIT_SECONDS = 0.05
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    def __init__(self, maxsize=WRITE_QUEUE_SIZE, batch_size=WRITE_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, sql, params):
+        self._ensure_started()
+        with span("db.enqueue"):
+            self._queue.put((sql, params))
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            try:
+                batch.append(self._queue.get(timeout=WRITE_BATCH_WAIT_SECONDS))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            writes = [item for item in batch if item is not _STOP]
+            try:
+                if writes:
+                    self._write(writes)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(writes) < len(batch):
+                return
+
+    def _write(self, writes):
+        try:
+            with span("db.write_batch"), get_connection() as conn, conn:
+                for sql, group in itertools.groupby(writes, key=lambda item: item[0]):
+                    conn.executemany(sql, [params for _, params in group])
+        except sqlite3.Error:
+            # Fall back to one transaction per row so a single bad row does not drop the batch
+            logger.exception("Batched write failed; retrying %d rows one by one", len(writes))
+            for sql, params in writes:
+                try:
+                    with get_connection() as conn, conn:
+                        conn.execute(sql, params)
+                except sqlite3.Error:
+                    logger.exception("Dropping write: %s", sql)
+
+    def flush(self):
+        """Block until everything submitted so far is committed."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+
+write_queue = WriteBehindQueue()
+atexit.register(write_queue.close)
+
+
+def flush_writes():
+    write_queue.flush()
 
 
 def register_user(username, password):
-    password_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt())
-    conn = sqlite3.connect(DB_FILE)  # Use fakehr.db instead of users.db
-    cursor = conn.cursor()
-    cursor.execute('INSERT INTO users (username, password_hash) VALUES (?, ?)', (username, password_hash))
-    conn.commit()
-    conn.close()
+    with span("db.hash_password"):
+        password_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+    with span("db.register_user"), get_connection() as conn, conn:
+        conn.execute('INSERT INTO users (username, password_hash) VALUES (?, ?)', (username, password_hash))
     return True
 
 
 
 def get_user(username):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("SELECT * FROM users WHERE username = ?", (username,))
-    user = c.fetchone()
-    conn.close()
-    return user
+    with span("db.get_user"), get_connection() as conn:
+        return conn.execute("SELECT * FROM users WHERE username = ?", (username,)).fetchone()
 
 def save_feedback(username, rating, comment):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("INSERT INTO feedback (username, rating, comment, created_at) VALUES (?, ?, ?, datetime('now'))",
-              (username, rating, comment))
-    conn.commit()
-    conn.close()
+    # Same UTC format as SQLite's datetime('now'), taken when the feedback is submitted
+    created_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    write_queue.submit("INSERT INTO feedback (username, rating, comment, created_at) VALUES (?, ?, ?, ?)",
+                       (username, rating, comment, created_at))
 
 
 def get_all_feedback():
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("SELECT username, rating, comment, created_at FROM feedback ORDER BY created_at DESC")
-    feedback = c.fetchall()
-    conn.close()
-    return feedback
+    with span("db.all_feedback"), get_connection() as conn:
+        return conn.execute("SELECT username, rating, comment, created_at FROM feedback ORDER BY created_at DESC").fetchall()
 
 
 def save_generation_history(username, data_type, details):
-    print(f"📌 SAVING HISTORY → username: {username}, type: {data_type}, details: {details}")  # Debug line
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
+    logger.debug("Saving %s history for %s: %s", data_type, username, details)
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    c.execute("INSERT INTO history (username, data_type, details, timestamp) VALUES (?, ?, ?, ?)",
-              (username, data_type, details, timestamp))
-    conn.commit()
-    conn.close()
+    write_queue.submit("INSERT INTO history (username, data_type, details, timestamp) VALUES (?, ?, ?, ?)",
+                       (username, data_type, details, timestamp))
 
 def get_user_history(username):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("SELECT data_type, details, timestamp FROM history WHERE username = ? ORDER BY timestamp DESC", (username,))
-    history = c.fetchall()
-    conn.close()
-    return history
+    with span("db.user_history"), get_connection() as conn:
+        return conn.execute("SELECT data_type, details, timestamp FROM history WHERE username = ? ORDER BY timestamp DESC",
+                            (username,)).fetchall()
+
+# ------------------------
+# Keyset Pagination
+# ------------------------
+# Pages are fetched with a (sort key, id) cursor taken from the last row of the
+# previous page, so every page costs the same no matter how deep it is.
+
+def get_user_history_page(username, limit=HISTORY_PAGE_SIZE, before=None):
+    """Return (rows, next_cursor); pass next_cursor back as before to get the following page."""
+    with span("db.history_page"), get_connection() as conn:
+        if before is None:
+            rows = conn.execute(
+                "SELECT data_type, details, timestamp, id FROM history WHERE username = ? "
+                "ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (username, limit)
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT data_type, details, timestamp, id FROM history WHERE username = ? AND (timestamp, id) < (?, ?) "
+                "ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (username, before[0], before[1], limit)
+            ).fetchall()
+    next_cursor = (rows[-1][2], rows[-1][3]) if len(rows) == limit else None
+    return [row[:3] for row in rows], next_cursor
+
 
+def get_feedback_page(limit=FEEDBACK_PAGE_SIZE, before=None):
+    """Return (rows, next_cursor); pass next_cursor back as before to get the following page."""
+    with span("db.feedback_page"), get_connection() as conn:
+        if before is None:
+            rows = conn.execute(
+                "SELECT username, rating, comment, created_at, id FROM feedback "
+                "ORDER BY created_at DESC, id DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT username, rating, comment, created_at, id FROM feedback WHERE (created_at, id) < (?, ?) "
+                "ORDER BY created_at DESC, id DESC LIMIT ?",
+                (before[0], before[1], limit)
+            ).fetchall()
+    next_cursor = (rows[-1][3], rows[-1][4]) if len(rows) == limit else None
+    return [row[:4] for row in rows], next_cursor
@@ -1,43 +1,141 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from functools import reduce
+import os
+import re
+
 from faker import Faker
 import random
+import numpy as np
 import pandas as pd
 
+from telemetry import span
+from value_pools import PooledFaker, get_value_pool, pool_size_for
+
 fake = Faker()
 
+DEFAULT_CHUNK_SIZE = 50_000
+DEFAULT_SHARD_SIZE = 10_000
+
+DIGITS = "0123456789"
+BLOOD_GROUPS = ["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"]
+GENDERS = ["Male", "Female", "Other"]
+
 # ------------------------
 # Country Detection Based on Name
 # ------------------------
 
+# Checked in order: the first country whose hint appears anywhere in the name wins
+NAME_COUNTRY_HINTS = {
+    "IN": ['Raj', 'Ankit', 'Priya', 'Amit', 'Neha', 'Rahul', 'Kumar', 'Patel'],
+    "UK": ['George', 'Harry', 'Oliver', 'Amelia', 'Jack', 'Poppy'],
+    "CA": ['Liam', 'Noah', 'Logan', 'Emma', 'Avery', 'Jackson'],
+}
+DEFAULT_COUNTRY = "US"
+
+_name_pattern = None
+_hint_priority = {}
+_priority_country = []
+
+
+def _compile_name_classifier():
+    global _name_pattern, _hint_priority, _priority_country
+
+    _priority_country = list(NAME_COUNTRY_HINTS)
+    _hint_priority = {}
+    for priority, country_code in enumerate(_priority_country):
+        for hint in NAME_COUNTRY_HINTS[country_code]:
+            _hint_priority.setdefault(hint.lower(), priority)
+
+    if not _hint_priority:
+        _name_pattern = None
+        return
+
+    # The lookahead reports a match at every position (overlaps included), and the
+    # alternatives are ordered by priority so each position yields its best hint
+    hints = sorted(_hint_priority, key=lambda hint: (_hint_priority[hint], -len(hint)))
+    _name_pattern = re.compile("(?=(" + "|".join(re.escape(hint) for hint in hints) + "))")
+
+
+def register_name_hints(country_code, hints):
+    # New countries are checked after the existing ones
+    NAME_COUNTRY_HINTS.setdefault(country_code, []).extend(hints)
+    _compile_name_classifier()
+
+
 def detect_country_from_name(name):
-    indian_names = ['Raj', 'Ankit', 'Priya', 'Amit', 'Neha', 'Rahul', 'Kumar', 'Patel']
-    british_names = ['George', 'Harry', 'Oliver', 'Amelia', 'Jack', 'Poppy']
-    canadian_names = ['Liam', 'Noah', 'Logan', 'Emma', 'Avery', 'Jackson']
-
-    lower_name = name.lower()
-    if any(n.lower() in lower_name for n in indian_names):
-        return "IN"
-    elif any(n.lower() in lower_name for n in british_names):
-        return "UK"
-    elif any(n.lower() in lower_name for n in canadian_names):
-        return "CA"
-    else:
-        return "US"  # default fallback
+    if _name_pattern is None:
+        return DEFAULT_COUNTRY
+
+    best = None
+    for match in _name_pattern.finditer(name.lower()):
+        priority = _hint_priority[match.group(1)]
+        if priority == 0:
+            return _priority_country[0]
+        if best is None or priority < best:
+            best = priority
+
+    return DEFAULT_COUNTRY if best is None else _priority_country[best]
+
+
+def detect_countries_from_names(names):
+    # Generated names repeat a lot, so each distinct name is classified once
+    lookup = {name: detect_country_from_name(name) for name in set(names)}
+    return [lookup[name] for name in names]
+
+
+_compile_name_classifier()
 
 # ------------------------
 # Phone Number Generator by Country
 # ------------------------
 
+# Each format is a list of literal strings and (alphabet, length) random parts
+PHONE_FORMATS = {
+    "IN": ["+91 ", ("6789", 1), (DIGITS, 9)],
+    "US": ["+1 ", ("23456789", 1), (DIGITS, 2), "-", (DIGITS, 3), "-", (DIGITS, 4)],
+    "UK": ["+44 7", (DIGITS, 9)],
+    "CA": ["+1 ", ("204357", 3), "-", (DIGITS, 3), "-", (DIGITS, 4)],
+}
+DEFAULT_PHONE_FORMAT = ["+999 ", (DIGITS, 10)]
+
+
 def generate_phone_number_by_country(country_code):
-    if country_code == "IN":
-        return "+91 " + str(random.choice([6, 7, 8, 9])) + ''.join(random.choices("0123456789", k=9))
-    elif country_code == "US":
-        return "+1 " + ''.join(random.choices("23456789", k=1)) + ''.join(random.choices("0123456789", k=2)) + '-' + ''.join(random.choices("0123456789", k=3)) + '-' + ''.join(random.choices("0123456789", k=4))
-    elif country_code == "UK":
-        return "+44 7" + ''.join(random.choices("0123456789", k=9))
-    elif country_code == "CA":
-        return "+1 " + ''.join(random.choices("204357", k=3)) + '-' + ''.join(random.choices("0123456789", k=3)) + '-' + ''.join(random.choices("0123456789", k=4))
-    else:
-        return "+999 " + ''.join(random.choices("0123456789", k=10))
+    phone_format = PHONE_FORMATS.get(country_code, DEFAULT_PHONE_FORMAT)
+    return ''.join(
+        part if isinstance(part, str) else ''.join(random.choices(part[0], k=part[1]))
+        for part in phone_format
+    )
+
+
+def _random_strings(rng, size, alphabet, length):
+    # Draw a (size, length) matrix of characters and reinterpret each row as one string
+    chars = np.array(list(alphabet), dtype="<U1")
+    picks = chars[rng.integers(0, len(chars), size=(size, length))]
+    return np.ascontiguousarray(picks).view(f"<U{length}").reshape(size)
+
+
+def _concat_columns(parts):
+    return reduce(np.char.add, parts)
+
+
+def generate_phone_numbers_by_country(country_codes, rng):
+    codes = np.asarray(country_codes, dtype=object)
+    phones = np.empty(len(codes), dtype=object)
+
+    # Sorted so the RNG draws happen in the same order in every process (set order follows hash randomization)
+    for code in sorted(set(codes)):
+        mask = codes == code
+        size = int(mask.sum())
+        phone_format = PHONE_FORMATS.get(code, DEFAULT_PHONE_FORMAT)
+        parts = [
+            part if isinstance(part, str) else _random_strings(rng, size, part[0], part[1])
+            for part in phone_format
+        ]
+        phones[mask] = _concat_columns(parts)
+
+    return phones
 
 # ------------------------
 # Predefined Fields
@@ -57,78 +155,264 @@ PREDEFINED_FIELDS = {
     "experience": lambda: str(random.randint(0, 15)) + " years"
 }
 
+
+def _years_ago(today, years):
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:  # 29 Feb in a non-leap year
+        return today.replace(year=today.year - years, day=28)
+
+
+def _dates_of_birth(rng, size, minimum_age=21, maximum_age=60):
+    # Same window as Faker's date_of_birth, drawn as day offsets in one batch
+    today = date.today()
+    start = _years_ago(today, maximum_age + 1) + timedelta(days=1)
+    end = _years_ago(today, minimum_age)
+    offsets = rng.integers(0, (end - start).days + 1, size=size)
+    return np.datetime_as_string(np.datetime64(start, "D") + offsets, unit="D")
+
+
+def _faker_column(faker, provider, size):
+    # Pooled mode samples the expensive providers instead of calling Faker per row
+    sample_column = getattr(faker, "sample_column", None)
+    if sample_column is not None:
+        pooled = sample_column(provider, size)
+        if pooled is not None:
+            return pooled
+    method = getattr(faker, provider)
+    return [method() for _ in range(size)]
+
+
+# Column generators take (faker, rng, size, countries) and return one whole column
+COLUMN_GENERATORS = {
+    "country": lambda faker, rng, size, countries: countries,
+    "phone": lambda faker, rng, size, countries: generate_phone_numbers_by_country(countries, rng),
+    "email": lambda faker, rng, size, countries: _faker_column(faker, "email", size),
+    "address": lambda faker, rng, size, countries: _faker_column(faker, "address", size),
+    "job_title": lambda faker, rng, size, countries: _faker_column(faker, "job", size),
+    "company": lambda faker, rng, size, countries: _faker_column(faker, "company", size),
+    "dob": lambda faker, rng, size, countries: _dates_of_birth(rng, size),
+    "salary": lambda faker, rng, size, countries: rng.integers(30000, 150001, size=size).astype(str),
+    "skills": lambda faker, rng, size, countries: [', '.join(faker.words(nb=5)) for _ in range(size)],
+    "experience": lambda faker, rng, size, countries: np.char.add(
+        rng.integers(0, 16, size=size).astype(str), " years"
+    ),
+}
+
+# Fields whose values come from a pooled Faker provider in pooled mode
+POOLED_FIELD_PROVIDERS = {
+    "name": "name",
+    "country": "name",
+    "phone": "name",
+    "email": "email",
+    "address": "address",
+    "company": "company",
+    "job_title": "job",
+}
+
 # ------------------------
 # Smart Generator for Custom Fields
 # ------------------------
 
-def generate_fake_value_for_custom_field(field_name, country="US"):
-    field_name = field_name.lower()
-
-   
-    if "age" in field_name:
-        return str(random.randint(18, 60))
-    elif "city" in field_name:
-        return fake.city()
-    elif "state" in field_name:
-        return fake.state()
-    elif "zip" in field_name or "postal" in field_name:
-        return fake.postcode()
-    elif "website" in field_name or "url" in field_name:
-        return fake.url()
-    elif "linkedin" in field_name:
-        return f"https://linkedin.com/in/{fake.user_name()}"
-    elif "github" in field_name:
-        return f"https://github.com/{fake.user_name()}"
-    elif "blood" in field_name:
-        return random.choice(["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"])
-    elif "gender" in field_name:
-        return random.choice(["Male", "Female", "Other"])
+# Rules are checked in order and the first one with a keyword contained in the
+# lowercased field name wins. Generators have the same signature as
+# COLUMN_GENERATORS: (faker, rng, size, countries), where countries may be None.
+CUSTOM_FIELD_RULES = [
+    (("age",), lambda faker, rng, size, countries: rng.integers(18, 61, size=size).astype(str)),
+    (("city",), lambda faker, rng, size, countries: _faker_column(faker, "city", size)),
+    (("state",), lambda faker, rng, size, countries: _faker_column(faker, "state", size)),
+    (("zip", "postal"), lambda faker, rng, size, countries: _faker_column(faker, "postcode", size)),
+    (("website", "url"), lambda faker, rng, size, countries: _faker_column(faker, "url", size)),
+    (("linkedin",), lambda faker, rng, size, countries: [
+        f"https://linkedin.com/in/{faker.user_name()}" for _ in range(size)
+    ]),
+    (("github",), lambda faker, rng, size, countries: [
+        f"https://github.com/{faker.user_name()}" for _ in range(size)
+    ]),
+    (("blood",), lambda faker, rng, size, countries: rng.choice(BLOOD_GROUPS, size=size)),
+    (("gender",), lambda faker, rng, size, countries: rng.choice(GENDERS, size=size)),
+]
+
+
+def default_custom_field_generator(faker, rng, size, countries):
+    return _faker_column(faker, "word", size)
+
+
+# Rules added at runtime, in order, so worker processes can replay them (see _install_registries)
+_registered_rules = []
+
+
+def register_custom_field_rule(keywords, generator, first=True):
+    # Registered rules go ahead of the built-ins unless first=False. With workers > 1 under
+    # spawn/forkserver the generator is pickled, so it must be a module-level function.
+    if isinstance(keywords, str):
+        keywords = (keywords,)
+    rule = (tuple(keyword.lower() for keyword in keywords), generator)
+    _registered_rules.append((rule[0], generator, first))
+    if first:
+        CUSTOM_FIELD_RULES.insert(0, rule)
     else:
-        return fake.word()
+        CUSTOM_FIELD_RULES.append(rule)
+
+
+def resolve_custom_field(field_name):
+    key = field_name.lower()
+    for keywords, generator in CUSTOM_FIELD_RULES:
+        if any(keyword in key for keyword in keywords):
+            return generator
+    return default_custom_field_generator
+
+
+_rng = np.random.default_rng()
+
+
+def generate_fake_value_for_custom_field(field_name, country="US"):
+    return str(resolve_custom_field(field_name)(fake, _rng, 1, [country])[0])
+
+
+def generate_custom_field_column(field_name, size, rng, faker=fake, countries=None):
+    return resolve_custom_field(field_name)(faker, rng, size, countries)
 
 # ------------------------
 # Main Generator
 # ------------------------
 
-def generate_employee_data(num_rows, selected_fields, custom_fields):
-    all_rows = []
+def _resolve_generators(selected_fields, custom_fields):
+    # Each field name is classified once, then its generator fills the whole column.
+    # Custom fields always go through the custom-field rules, even when they share a
+    # predefined field's name (those generators need name-derived countries).
+    generators = [(field, COLUMN_GENERATORS.get(field) or resolve_custom_field(field), field in COLUMN_GENERATORS)
+                  for field in selected_fields if field != "name"]
+    generators += [(field, resolve_custom_field(field), False)
+                   for field in custom_fields if field not in selected_fields]
+    return generators
 
-    for idx in range(num_rows):
-        row = {"S.No": idx + 1}
 
-        # Generate name early for country detection
-        name = PREDEFINED_FIELDS["name"]() if "name" in selected_fields else fake.name()
-        row["name"] = name if "name" in selected_fields else None
-        country = detect_country_from_name(name)
+def _generate_columns(num_rows, selected_fields, custom_fields, faker, rng, start=1):
+    # Keep "S.No" first, then name, then selected/custom fields
+    columns = {"S.No": np.arange(start, start + num_rows)}
 
-        for field in selected_fields:
-            if field == "name":
-                continue  # already set
-            elif field == "phone":
-                row["phone"] = generate_phone_number_by_country(country)
-            elif field in PREDEFINED_FIELDS:
-                row[field] = PREDEFINED_FIELDS[field]()
-            else:
-                row[field] = generate_fake_value_for_custom_field(field, country)
+    # Names drive country detection, so they are only generated when something needs them
+    names = None
+    countries = None
+    if "name" in selected_fields or "country" in selected_fields or "phone" in selected_fields:
+        with span("generate.column", field="name"):
+            names = _faker_column(faker, "name", num_rows)
+        with span("generate.detect_countries"):
+            countries = detect_countries_from_names(names)
+    if "name" in selected_fields:
+        columns["name"] = names
 
-        for custom_field in custom_fields:
-            if custom_field not in selected_fields:
-                row[custom_field] = generate_fake_value_for_custom_field(custom_field, country)
+    for field, generator, predefined in _resolve_generators(selected_fields, custom_fields):
+        with span("generate.column", field=field if predefined else "custom"):
+            columns[field] = generator(faker, rng, num_rows, countries)
 
-        all_rows.append(row)
+    return columns
 
-    df = pd.DataFrame(all_rows)
 
-    # Keep "S.No" first, then selected/custom fields
-    columns_order = ["S.No"]
-    if "name" in selected_fields:
-        columns_order.append("name")
-    for col in selected_fields:
-        if col != "name":
-            columns_order.append(col)
-    for col in custom_fields:
-        if col not in selected_fields:
-            columns_order.append(col)
-
-    df = df[columns_order]
-    return df
+# ------------------------
+# Sharded Generation
+# ------------------------
+# Rows are split into fixed-size shards and every shard gets its own Faker and
+# NumPy generator seeded from (seed, shard_index). Shard boundaries never depend
+# on the worker count or the output chunk size, so a given seed always produces
+# the same rows.
+
+def _shard_generators(seed, shard_index):
+    seed_seq = np.random.SeedSequence(seed, spawn_key=(shard_index,))
+    faker = Faker()
+    faker.seed_instance(int(seed_seq.generate_state(1, np.uint64)[0]))
+    return faker, np.random.default_rng(seed_seq)
+
+
+def _generate_shard(shard):
+    shard_index, start, size, selected_fields, custom_fields, seed, pool_size = shard
+    faker, rng = _shard_generators(seed, shard_index)
+    if pool_size:
+        faker = PooledFaker(faker, rng, pool_size)
+    return pd.DataFrame(_generate_columns(size, selected_fields, custom_fields, faker, rng, start=start))
+
+
+def _install_registries(name_hints, registered_rules):
+    # Workers started with spawn/forkserver import this module afresh and would miss
+    # what the parent registered; forked workers already have it and change nothing
+    if list(name_hints.items()) != list(NAME_COUNTRY_HINTS.items()):
+        NAME_COUNTRY_HINTS.clear()
+        NAME_COUNTRY_HINTS.update(name_hints)
+        _compile_name_classifier()
+    for keywords, generator, first in registered_rules[len(_registered_rules):]:
+        register_custom_field_rule(keywords, generator, first)
+
+
+def _warm_value_pools(selected_fields, custom_fields, pool_size):
+    # Build the needed pools once up front instead of once per worker process
+    fields = set(selected_fields) | set(custom_fields)
+    for field, provider in POOLED_FIELD_PROVIDERS.items():
+        if field in fields:
+            get_value_pool(provider, pool_size, fake.locales[0])
+
+
+def _iter_shards(num_rows, selected_fields, custom_fields, seed, workers, shard_size, pool_uniqueness=None):
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    pool_size = None
+    if pool_uniqueness is not None:
+        pool_size = pool_size_for(num_rows, pool_uniqueness)
+        _warm_value_pools(selected_fields, custom_fields, pool_size)
+
+    shards = (
+        (shard_index, offset + 1, min(shard_size, num_rows - offset),
+         list(selected_fields), list(custom_fields), seed, pool_size)
+        for shard_index, offset in enumerate(range(0, num_rows, shard_size))
+    )
+
+    if workers <= 1:
+        yield from map(_generate_shard, shards)
+        return
+
+    # Keep a small window of shards in flight so results are yielded in "S.No" order
+    registries = ({code: list(hints) for code, hints in NAME_COUNTRY_HINTS.items()}, list(_registered_rules))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_install_registries, initargs=registries) as executor:
+        pending = deque()
+        for shard in shards:
+            pending.append(executor.submit(_generate_shard, shard))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def generate_employee_data(num_rows, selected_fields, custom_fields, seed=None, workers=1, pool_uniqueness=None):
+    # pool_uniqueness (0, 1] turns on pooled mode for the slow Faker providers
+    # Per-column spans are only recorded here when workers=1; worker processes keep their own
+    with span("generate.employee_data"):
+        frames = list(_iter_shards(num_rows, selected_fields, custom_fields, seed, workers,
+                                   DEFAULT_SHARD_SIZE, pool_uniqueness))
+        if not frames:
+            return _generate_shard((0, 1, 0, selected_fields, custom_fields, seed, None))
+        return pd.concat(frames, ignore_index=True)
+
+
+def iter_employee_data(num_rows, selected_fields, custom_fields, chunk_size=DEFAULT_CHUNK_SIZE, seed=None, workers=1,
+                       pool_uniqueness=None):
+    # Yields DataFrames of at most chunk_size rows; "S.No" keeps counting across chunks
+    shards = _iter_shards(num_rows, selected_fields, custom_fields, seed, workers, DEFAULT_SHARD_SIZE, pool_uniqueness)
+    yield from _rechunk(shards, chunk_size)
+
+
+def _rechunk(frames, chunk_size):
+    buffer, buffered = [], 0
+    for frame in frames:
+        while len(frame):
+            take = min(chunk_size - buffered, len(frame))
+            buffer.append(frame.iloc[:take])
+            buffered += take
+            frame = frame.iloc[take:]
+            if buffered == chunk_size:
+                yield pd.concat(buffer, ignore_index=True)
+                buffer, buffered = [], 0
+    if buffer:
+        yield pd.concat(buffer, ignore_index=True)
@@ -0,0 +1,86 @@
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+# ------------------------
+# On-demand Export Encoding
+# ------------------------
+# Datasets are encoded to CSV / JSON / Excel only when a download is requested,
+# and each (dataset version, format) pair is encoded at most once while it stays
+# in the bounded in-memory cache.
+
+EXPORT_FORMATS = ("csv", "json", "xlsx")
+
+EXPORT_MIME_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+EXPORT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_exports = OrderedDict()
+_exports_bytes = 0
+_lock = threading.Lock()
+
+
+def write_xlsx(df, sheet_name="Sheet1"):
+    # openpyxl's write-only mode streams rows out instead of building every cell object
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=sheet_name)
+    sheet.append([str(col) for col in df.columns])
+    values = df.astype(object).where(df.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        sheet.append(row)
+
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def encode_dataframe(df, file_format, sheet_name="Sheet1"):
+    if file_format == "csv":
+        return df.to_csv(index=False).encode("utf-8")
+    if file_format == "json":
+        return df.to_json(orient="records").encode("utf-8")
+    if file_format == "xlsx":
+        return write_xlsx(df, sheet_name)
+    raise ValueError(f"Unsupported export format: {file_format}")
+
+
+def is_export_ready(version, file_format):
+    with _lock:
+        return (version, file_format) in _exports
+
+
+def get_export(version, file_format, load_df, sheet_name="Sheet1"):
+    """Return the encoded bytes for a dataset version, encoding on first request.
+
+    load_df is only called on a cache miss, so callers can pass a loader that reads from disk.
+    """
+    global _exports_bytes
+    key = (version, file_format)
+    with _lock:
+        if key in _exports:
+            _exports.move_to_end(key)
+            return _exports[key]
+
+    data = encode_dataframe(load_df(), file_format, sheet_name)
+
+    with _lock:
+        if key not in _exports:
+            _exports[key] = data
+            _exports_bytes += len(data)
+            while _exports_bytes > EXPORT_CACHE_MAX_BYTES and len(_exports) > 1:
+                _, evicted = _exports.popitem(last=False)
+                _exports_bytes -= len(evicted)
+        return _exports[key]
+
+
+def clear_exports():
+    global _exports_bytes
+    with _lock:
+        _exports.clear()
+        _exports_bytes = 0
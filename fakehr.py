@@ -0,0 +1,178 @@
+"""Headless entry point for bulk generation, for batch jobs that don't go through the Streamlit UI.
+
+    python fakehr.py generate --rows 1000000 --workers 4 --format parquet --output output/employees.parquet
+    python fakehr.py resumes --input output/employees.parquet --zip output/zips/all_resumes.zip
+"""
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+from data_sinks import SINKS, write_chunks
+from employee_generator import DEFAULT_CHUNK_SIZE, PREDEFINED_FIELDS, generate_employee_data, iter_employee_data
+
+
+def _split(value):
+    return [item.strip() for item in value.split(",") if item.strip()] if value else []
+
+
+def _fields(args):
+    fields = _split(args.fields) or list(PREDEFINED_FIELDS)
+    unknown = [field for field in fields if field not in PREDEFINED_FIELDS]
+    if unknown:
+        raise SystemExit(f"Unknown fields: {', '.join(unknown)} (choose from {', '.join(PREDEFINED_FIELDS)})")
+    return fields
+
+
+def _progress(done, total):
+    print(f"\r{done}/{total}", end="" if done < total else "\n", file=sys.stderr, flush=True)
+
+
+# ------------------------
+# fakehr generate
+# ------------------------
+
+def run_generate(args):
+    file_format = args.format or os.path.splitext(args.output)[1].lstrip(".") or "csv"
+    output = args.output if os.path.splitext(args.output)[1] else f"{args.output}.{file_format}"
+    chunks = iter_employee_data(args.rows, _fields(args), _split(args.custom_fields), chunk_size=args.chunk_size,
+                                seed=args.seed, workers=args.workers, pool_uniqueness=args.pool_uniqueness)
+
+    def counted(chunks):
+        done = 0
+        for chunk in chunks:
+            done += len(chunk)
+            _progress(done, args.rows)
+            yield chunk
+
+    rows = write_chunks(counted(chunks), output, file_format)
+    print(f"Wrote {rows} rows to {output}", file=sys.stderr)
+    return 0
+
+
+# ------------------------
+# fakehr resumes
+# ------------------------
+
+def _load_input(args):
+    if not args.input:
+        return generate_employee_data(args.rows, _fields(args), _split(args.custom_fields), seed=args.seed,
+                                      workers=args.workers, pool_uniqueness=args.pool_uniqueness)
+    ext = os.path.splitext(args.input)[1].lower()
+    if ext == ".parquet":
+        return pd.read_parquet(args.input)
+    if ext in (".json", ".jsonl"):
+        return pd.read_json(args.input, lines=ext == ".jsonl")
+    if ext == ".xlsx":
+        return pd.read_excel(args.input)
+    return pd.read_csv(args.input)
+
+
+def run_resumes(args):
+    # Imported here so `fakehr generate` never loads the LLM SDK or the PDF toolchain
+    from gemini_resume import (CANDIDATES_PER_REQUEST, MAX_CONCURRENCY, REQUESTS_PER_MINUTE, generate_fallback_resume,
+                               generate_resumes_batch, resume_contact, resume_prompt_fields, select_resume_fields)
+    from generate_pdf import save_resumes_as_combined_pdf, save_resumes_as_pdfs
+
+    df = _load_input(args)
+    df.columns = [str(col).strip().lower() for col in df.columns]
+    if "name" not in df.columns:
+        raise SystemExit("A 'name' column is required to generate resumes.")
+    if args.limit:
+        df = df.head(args.limit)
+
+    selected_fields = select_resume_fields(df.columns)
+    candidates = []
+    for employee_data in df.to_dict(orient="records"):
+        if employee_data.get("name"):
+            candidates.append((employee_data, resume_prompt_fields(employee_data, selected_fields)))
+
+    print(f"Generating {len(candidates)} resumes", file=sys.stderr)
+    if args.no_llm:
+        resumes = [generate_fallback_resume(employee_data["name"]) for employee_data, _ in candidates]
+    else:
+        resumes = generate_resumes_batch(
+            [prompt_fields for _, prompt_fields in candidates],
+            max_workers=args.concurrency or MAX_CONCURRENCY,
+            requests_per_minute=args.requests_per_minute or REQUESTS_PER_MINUTE,
+            candidates_per_request=args.candidates_per_request or CANDIDATES_PER_REQUEST,
+            progress_callback=_progress
+        )
+
+    pdf_jobs = [
+        (employee_data["name"], {
+            **resume_data,
+            "title": prompt_fields.get("Job Title", ""),
+            "contact": resume_contact(employee_data)
+        })
+        for (employee_data, prompt_fields), resume_data in zip(candidates, resumes)
+    ]
+
+    print(f"Rendering {len(pdf_jobs)} PDFs to {args.output_dir}", file=sys.stderr)
+    rendered = save_resumes_as_pdfs(pdf_jobs, args.output_dir, zip_path=args.zip, backend=args.backend)
+    failed = [(name, error) for (name, _), (_, error) in zip(pdf_jobs, rendered) if error is not None]
+    for name, error in failed:
+        print(f"Error generating resume for {name}: {error}", file=sys.stderr)
+
+    if args.combined:
+        save_resumes_as_combined_pdf(
+            [job for job, (_, error) in zip(pdf_jobs, rendered) if error is None],
+            args.combined,
+            backend=args.backend
+        )
+        print(f"Wrote combined PDF to {args.combined}", file=sys.stderr)
+
+    print(f"Rendered {len(pdf_jobs) - len(failed)}/{len(pdf_jobs)} resumes", file=sys.stderr)
+    return 1 if pdf_jobs and len(failed) == len(pdf_jobs) else 0
+
+
+# ------------------------
+# Command Line
+# ------------------------
+
+def _add_dataset_arguments(parser, rows_default):
+    parser.add_argument("--rows", type=int, default=rows_default, help="number of employees to generate")
+    parser.add_argument("--fields", help="comma-separated predefined fields (default: all)")
+    parser.add_argument("--custom-fields", help="comma-separated custom field names")
+    parser.add_argument("--seed", type=int, help="seed for reproducible output")
+    parser.add_argument("--workers", type=int, default=1, help="generator processes")
+    parser.add_argument("--pool-uniqueness", type=float,
+                        help="sample slow Faker fields from cached pools with this share of unique values (0-1]")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="fakehr", description="Generate fake employee data and resumes without the UI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="generate an employee dataset")
+    _add_dataset_arguments(generate, rows_default=1000)
+    generate.add_argument("--format", choices=sorted(set(SINKS) | {"json"}),
+                          help="output format (default: from the output extension, else csv)")
+    generate.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows generated and written at a time")
+    generate.add_argument("--output", "-o", default=os.path.join("output", "employee_data.csv"), help="output file")
+    generate.set_defaults(run=run_generate)
+
+    resumes = commands.add_parser("resumes", help="generate resume PDFs for a dataset")
+    resumes.add_argument("--input", "-i", help="dataset file (csv, json, jsonl, parquet, xlsx); generated when omitted")
+    _add_dataset_arguments(resumes, rows_default=10)
+    resumes.add_argument("--limit", type=int, help="only the first N rows of the dataset")
+    resumes.add_argument("--output-dir", default=os.path.join("output", "resumes"), help="directory for the PDFs")
+    resumes.add_argument("--zip", help="also write every PDF into this ZIP archive")
+    resumes.add_argument("--combined", help="also write one combined PDF to this path")
+    resumes.add_argument("--backend", help="PDF backend: auto, wkhtmltopdf or native")
+    resumes.add_argument("--no-llm", action="store_true", help="use Faker fallback resumes instead of calling Gemini")
+    resumes.add_argument("--concurrency", type=int, help="concurrent Gemini requests")
+    resumes.add_argument("--requests-per-minute", type=int, help="Gemini request quota")
+    resumes.add_argument("--candidates-per-request", type=int, help="candidates packed into one Gemini request")
+    resumes.set_defaults(run=run_resumes)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
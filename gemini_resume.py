@@ -1,86 +1,430 @@
 import os
 import json
-import google.generativeai as genai
-import streamlit as st
-from faker import Faker
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import random
-
-# Load Gemini API key from Streamlit secrets
-genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
+from resume_cache import ResumeCache, canonicalize_fields, resume_cache_key
+from telemetry import span
 
 # Use Gemini 1.5 Flash model
-model = genai.GenerativeModel(model_name="models/gemini-1.5-flash-latest")
+GEMINI_MODEL_NAME = "models/gemini-1.5-flash-latest"
 
-# Faker for fallback
-faker = Faker()
 
-def generate_resume_with_gemini(fields):
-    name = fields.get("name", "John Doe")
-    job_title = fields.get("Job Title") or fields.get("job_title") or "General Professional"
+def get_api_key():
+    # GEMINI_API_KEY (or .env) for scripts and batch jobs, Streamlit secrets when running the app
+    from dotenv import load_dotenv
 
-    # Prompt for Gemini
-    prompt = f"""
-You are a professional resume writer.
+    load_dotenv()
+    if os.environ.get("GEMINI_API_KEY"):
+        return os.environ["GEMINI_API_KEY"]
+    try:
+        import streamlit as st
 
-Generate a clean, realistic, one-page resume based on the details below. If a specific job title is provided, tailor the resume accordingly. Fill all fields with real, professional content. Do not use placeholders or dummy values.
+        return st.secrets["GEMINI_API_KEY"]
+    except Exception:
+        return None
 
-### Required JSON Fields:
-- "summary": 2–3 sentence professional overview (written in third person).
+
+class LazyGeminiModel:
+    """Stands in for genai.GenerativeModel; the SDK is imported and configured on the first request."""
+
+    def __init__(self, model_name=GEMINI_MODEL_NAME):
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._model is None:
+                import google.generativeai as genai
+
+                genai.configure(api_key=get_api_key())
+                self._model = genai.GenerativeModel(model_name=self.model_name)
+        return self._model
+
+    def generate_content(self, prompt):
+        return self._load().generate_content(prompt)
+
+
+gemini_model = LazyGeminiModel()
+
+# Faker for fallback, created on first use
+_faker = None
+
+# Persistent cache of model responses, shared by every call unless one is passed in
+resume_cache = ResumeCache()
+
+# Quota settings for batch generation (Gemini 1.5 Flash free tier: 15 requests/minute)
+REQUESTS_PER_MINUTE = 15
+MAX_CONCURRENCY = 4
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 60.0
+
+# Batch prompts: candidates packed into one request, and re-request rounds for invalid elements
+CANDIDATES_PER_REQUEST = 5
+BATCH_MAX_ROUNDS = 2
+
+# ------------------------
+# Rate Limiting
+# ------------------------
+
+class TokenBucket:
+    """Thread-safe token bucket: acquire() blocks until a request may be sent."""
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or max(1, int(rate_per_minute // 4))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def is_quota_error(error):
+    # Judged from the raised exception only; a valid resume may well mention "quota" or "429"
+    if getattr(error, "code", None) == 429:
+        return True
+    try:
+        from google.api_core.exceptions import ResourceExhausted
+    except ImportError:
+        return False
+    return isinstance(error, ResourceExhausted)
+
+
+def backoff_delay(attempt):
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+# ------------------------
+# Resume Generation
+# ------------------------
+
+RESUME_FIELDS_SPEC = """- "summary": 2–3 sentence professional overview (written in third person).
 - "experience": 4–6 bullet points of achievements and work impact.
 - "education": 1-line highest degree with institution and year.
 - "certifications": Short string (or empty if none).
 - "skills": 5–8 relevant technical or soft skills.
 - "languages": 2–3 languages with proficiency levels.
 - "projects": 2–3 realistic project descriptions (1–2 lines each).
-- "awards": 1–3 professional awards or recognitions.
+- "awards": 1–3 professional awards or recognitions."""
 
-### Candidate Details:
-{json.dumps(fields, indent=2)}
-
-### Output JSON Format:
-{{
-  "summary": "...",
+RESUME_JSON_FORMAT = """  "summary": "...",
   "experience": ["...", "..."],
   "education": "...",
   "certifications": "...",
   "skills": ["...", "..."],
   "languages": ["...", "..."],
   "projects": ["...", "..."],
-  "awards": ["...", "..."]
+  "awards": ["...", "..."]"""
+
+# Expected type of every field in a generated resume
+RESUME_SCHEMA = {
+    "summary": str,
+    "experience": list,
+    "education": str,
+    "certifications": str,
+    "skills": list,
+    "languages": list,
+    "projects": list,
+    "awards": list,
+}
+
+
+def build_resume_prompt(fields):
+    return f"""
+You are a professional resume writer.
+
+Generate a clean, realistic, one-page resume based on the details below. If a specific job title is provided, tailor the resume accordingly. Fill all fields with real, professional content. Do not use placeholders or dummy values.
+
+### Required JSON Fields:
+{RESUME_FIELDS_SPEC}
+
+### Candidate Details:
+{json.dumps(fields, indent=2)}
+
+### Output JSON Format:
+{{
+{RESUME_JSON_FORMAT}
 }}
 
 Only return the JSON object. Do not include any markdown or text outside the JSON.
 """
 
-    try:
-        response = model.generate_content(prompt)
-        json_text = response.text.strip()
 
-        # If Gemini wrapped it in a code block
-        if json_text.startswith("```json"):
-            json_text = json_text.strip("```json").strip("```").strip()
+def build_batch_resume_prompt(fields_list):
+    candidates = [{"id": index, **fields} for index, fields in enumerate(fields_list)]
+    return f"""
+You are a professional resume writer.
 
-        if "429" in json_text or "quota" in json_text.lower():
-            raise Exception("QuotaExceeded")
+Generate a clean, realistic, one-page resume for EACH candidate below. If a specific job title is provided, tailor that candidate's resume accordingly. Fill all fields with real, professional content. Do not use placeholders or dummy values.
+
+### Required JSON Fields (for every resume):
+{RESUME_FIELDS_SPEC}
+
+### Candidates:
+{json.dumps(candidates, indent=2)}
+
+### Output JSON Format:
+[
+  {{
+  "id": 0,
+{RESUME_JSON_FORMAT}
+  }}
+]
+
+Return a JSON array with exactly one object per candidate, each carrying the candidate's "id". Only return the JSON array. Do not include any markdown or text outside the JSON.
+"""
 
-        resume_data = json.loads(json_text)
-        return resume_data
 
+def _strip_code_fence(text):
+    json_text = text.strip()
+
+    # If Gemini wrapped it in a code block
+    if json_text.startswith("```json"):
+        json_text = json_text.strip("```json").strip("```").strip()
+
+    return json_text
+
+
+def parse_resume_json(text):
+    resume_data = json.loads(_strip_code_fence(text))
+    if not validate_resume(resume_data):
+        raise ValueError("Response does not match the resume schema")
+    return resume_data
+
+
+def parse_batch_resume_json(text):
+    items = json.loads(_strip_code_fence(text))
+    if not isinstance(items, list):
+        raise ValueError("Expected a JSON array of resumes")
+    return items
+
+
+def validate_resume(resume_data):
+    return isinstance(resume_data, dict) and all(
+        isinstance(resume_data.get(key), expected) for key, expected in RESUME_SCHEMA.items()
+    )
+
+
+def error_resume(error):
+    # "error" marks it as a failed generation rather than a model response (see is_error_resume)
+    return {
+        "error": str(error),
+        "summary": f"Error generating resume: {str(error)}",
+        "experience": [],
+        "education": "",
+        "certifications": "",
+        "skills": [],
+        "languages": [],
+        "projects": [],
+        "awards": []
+    }
+
+
+def is_error_resume(resume_data):
+    return not validate_resume(resume_data) or "error" in resume_data
+
+
+def _call_model(model, prompt, parse, rate_limiter, max_retries):
+    # Quota errors are retried with exponential backoff; anything else is raised at once
+    for attempt in range(max_retries + 1):
+        if rate_limiter is not None:
+            with span("gemini.rate_limit_wait"):
+                rate_limiter.acquire()
+        try:
+            with span("gemini.request"):
+                text = model.generate_content(prompt).text
+            with span("gemini.parse"):
+                return parse(text)
+        except Exception as e:
+            if not is_quota_error(e) or attempt >= max_retries:
+                raise
+            with span("gemini.backoff"):
+                time.sleep(backoff_delay(attempt))
+
+
+def _model_name(model):
+    return getattr(model, "model_name", type(model).__name__)
+
+
+def _cache_key(fields, model_name):
+    return resume_cache_key(build_resume_prompt(canonicalize_fields(fields)), model_name)
+
+
+def resume_fingerprint(fields, model=None):
+    """Identifies the model response for these prompt fields (it is also the response cache key)."""
+    return _cache_key(fields, _model_name(model or gemini_model))
+
+
+def generate_resume_with_gemini(fields, model=None, rate_limiter=None, max_retries=0, cache=None):
+    # Falls back to Faker once quota retries run out. Pass cache=False to bypass the response cache.
+    model = model or gemini_model
+    cache = resume_cache if cache is None else cache
+    name = fields.get("name", "John Doe")
+
+    model_name = _model_name(model)
+    cache_key = _cache_key(fields, model_name)
+    if cache:
+        with span("gemini.cache_lookup"):
+            cached = cache.get(cache_key)
+        # Entries stored before responses were validated may not be resumes
+        if cached is not None and validate_resume(cached):
+            return cached
+
+    try:
+        resume_data = _call_model(model, build_resume_prompt(fields), parse_resume_json, rate_limiter, max_retries)
     except Exception as e:
-        if "QuotaExceeded" in str(e) or "quota" in str(e).lower():
+        if is_quota_error(e):
             return generate_fallback_resume(name)
-        return {
-            "summary": f"Error generating resume: {str(e)}",
-            "experience": [],
-            "education": "",
-            "certifications": "",
-            "skills": [],
-            "languages": [],
-            "projects": [],
-            "awards": []
+        return error_resume(e)
+
+    if cache:
+        with span("gemini.cache_store"):
+            cache.set(cache_key, model_name, resume_data)
+    return resume_data
+
+
+def generate_resume_group_with_gemini(fields_group, model=None, rate_limiter=None, max_retries=0, cache=None,
+                                      max_rounds=BATCH_MAX_ROUNDS):
+    """Generate several resumes from one request per round.
+
+    Elements that are missing or fail RESUME_SCHEMA are re-requested on their own in
+    the next round; whatever is still missing afterwards goes through the single path.
+    """
+    model = model or gemini_model
+    cache = resume_cache if cache is None else cache
+    model_name = _model_name(model)
+
+    results = [None] * len(fields_group)
+    cache_keys = [_cache_key(fields, model_name) for fields in fields_group]
+    pending = []
+    for index, cache_key in enumerate(cache_keys):
+        with span("gemini.cache_lookup"):
+            cached = cache.get(cache_key) if cache else None
+        if cached is not None and validate_resume(cached):
+            results[index] = cached
+        else:
+            pending.append(index)
+
+    for _ in range(max_rounds):
+        if len(pending) < 2:
+            break
+        prompt = build_batch_resume_prompt([fields_group[index] for index in pending])
+        try:
+            items = _call_model(model, prompt, parse_batch_resume_json, rate_limiter, max_retries)
+        except Exception as e:
+            if is_quota_error(e):
+                # Retries are spent and the quota is gone; one request per candidate would only add load
+                for index in pending:
+                    results[index] = generate_fallback_resume(fields_group[index].get("name", "John Doe"))
+                return results
+            break
+
+        by_id = {item.get("id"): item for item in items if isinstance(item, dict)}
+        failed = []
+        for position, index in enumerate(pending):
+            resume_data = {key: value for key, value in by_id.get(position, {}).items() if key != "id"}
+            if not validate_resume(resume_data):
+                failed.append(index)
+                continue
+            results[index] = resume_data
+            if cache:
+                cache.set(cache_keys[index], model_name, resume_data)
+        pending = failed
+
+    for index in pending:
+        results[index] = generate_resume_with_gemini(fields_group[index], model, rate_limiter, max_retries, cache)
+    return results
+
+
+def generate_resumes_batch(fields_list, model=None, max_workers=MAX_CONCURRENCY,
+                           requests_per_minute=REQUESTS_PER_MINUTE, max_retries=MAX_RETRIES,
+                           progress_callback=None, cache=None, candidates_per_request=CANDIDATES_PER_REQUEST):
+    """Generate resumes concurrently; results keep the order of fields_list.
+
+    Up to candidates_per_request candidates share one model request.
+    progress_callback(done, total) runs on the calling thread, so it may update Streamlit widgets.
+    """
+    rate_limiter = TokenBucket(requests_per_minute) if requests_per_minute else None
+    group_size = max(1, candidates_per_request)
+    results = [None] * len(fields_list)
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(generate_resume_group_with_gemini, fields_list[start:start + group_size],
+                            model, rate_limiter, max_retries, cache): start
+            for start in range(0, len(fields_list), group_size)
         }
+        for future in as_completed(futures):
+            group = future.result()
+            start = futures[future]
+            results[start:start + len(group)] = group
+            done += len(group)
+            if progress_callback is not None:
+                progress_callback(done, len(fields_list))
+
+    return results
+
+# ------------------------
+# Candidate Fields
+# ------------------------
+# Which dataset columns go into the prompt, shared by the resume page and the CLI
+
+RESUME_CORE_FIELDS = ["job_title", "skills", "experience"]
+RESUME_OPTIONAL_FIELDS = ["education", "location", "email", "phone", "linkedin", "github", "certifications"]
+
+
+def select_resume_fields(columns):
+    selected = ["name"] + [field for field in RESUME_CORE_FIELDS if field in columns]
+    selected += [field for field in RESUME_OPTIONAL_FIELDS if field in columns and field not in selected]
+    return selected
+
+
+def resume_prompt_fields(employee_data, selected_fields):
+    prompt_fields = {}
+    for key in selected_fields:
+        display_key = "Job Title" if key == "job_title" else key
+        prompt_fields[display_key] = employee_data.get(key, "")
+
+    # Fallback to 'job_profiles' if 'job_title' is missing
+    if not prompt_fields.get("Job Title") and "job_profiles" in employee_data:
+        prompt_fields["Job Title"] = employee_data.get("job_profiles", "")
+    return prompt_fields
+
+
+def resume_contact(employee_data):
+    return " | ".join(filter(None, [
+        employee_data.get("email", ""),
+        employee_data.get("phone", ""),
+        employee_data.get("linkedin", "")
+    ]))
+
+
+def _get_faker():
+    global _faker
+    if _faker is None:
+        from faker import Faker
+
+        _faker = Faker()
+    return _faker
+
 
 def generate_fallback_resume(name):
+    faker = _get_faker()
     return {
         "summary": f"{name} is a passionate and dedicated professional with strong expertise in {faker.job().lower()} and a proven track record of delivering results.",
         "experience": [
@@ -1,37 +1,80 @@
+import hashlib
 import os
 import platform
 import re
-import pdfkit
-from jinja2 import Environment, FileSystemLoader
-
-if platform.system() == "Windows":
-    WKHTMLTOPDF_PATH = r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe"
-elif platform.system() == "Linux":
-    WKHTMLTOPDF_PATH = "/usr/bin/wkhtmltopdf"
-else:
-    raise OSError("Unsupported OS for wkhtmltopdf configuration.")
-
-# Check if the path exists
-if not os.path.exists(WKHTMLTOPDF_PATH):
-    raise OSError(f"wkhtmltopdf not found at: {WKHTMLTOPDF_PATH}")
-
-# Configure pdfkit
-pdfkit_config = pdfkit.configuration(wkhtmltopdf=WKHTMLTOPDF_PATH)
+import shutil
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+import pdf_native
+from telemetry import span
+
+# Explicit override; otherwise the platform default is looked up on first use
+WKHTMLTOPDF_PATH = os.environ.get("WKHTMLTOPDF_PATH")
+
+# "auto" uses wkhtmltopdf when it is installed and the native renderer otherwise
+PDF_BACKEND = os.environ.get("FAKEHR_PDF_BACKEND", "auto")
+
+TEMPLATE_DIR = "templates"
+TEMPLATE_NAME = "resume_template.html"
+
+# wkhtmltopdf has no server mode, so throughput comes from running several
+# renderer processes side by side on a long-lived pool of worker threads
+RENDER_WORKERS = max(2, min(8, os.cpu_count() or 1))
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def default_wkhtmltopdf_path():
+    if platform.system() == "Windows":
+        return r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe"
+    if platform.system() == "Linux":
+        return "/usr/bin/wkhtmltopdf"
+    return shutil.which("wkhtmltopdf")
+
+
 def sanitize_filename(name):
     """Clean the filename to avoid illegal characters and keep it short."""
     name = re.sub(r'[^\w\s-]', '', name)
     name = name.strip().replace(' ', '_')
     return name[:50]
 
-def save_resume_as_pdf(name, resume_data, directory="output/resumes"):
-    os.makedirs(directory, exist_ok=True)
 
-    # Load Jinja2 HTML template
-    env = Environment(loader=FileSystemLoader("templates"))
-    template = env.get_template("resume_template.html")
+@lru_cache(maxsize=64)
+def _file_digest(path, mtime_ns, size):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def file_fingerprint(path):
+    # Re-hashed only when the file's mtime or size changes
+    stat = os.stat(path)
+    return _file_digest(path, stat.st_mtime_ns, stat.st_size)
+
+
+def template_fingerprint(template_dir=TEMPLATE_DIR, template_name=TEMPLATE_NAME):
+    return file_fingerprint(os.path.join(template_dir, template_name))
+
+
+@lru_cache(maxsize=8)
+def _compile_template(template_dir, template_name, fingerprint):
+    from jinja2 import Environment, FileSystemLoader
 
-    # Render HTML from template
-    html_out = template.render(
+    env = Environment(loader=FileSystemLoader(template_dir), auto_reload=False)
+    return env.get_template(template_name)
+
+
+def get_resume_template(template_dir=TEMPLATE_DIR, template_name=TEMPLATE_NAME):
+    # Compiled once per version of the template file instead of on every resume
+    return _compile_template(template_dir, template_name, template_fingerprint(template_dir, template_name))
+
+
+def render_resume_html(name, resume_data):
+    return get_resume_template().render(
         name=name,
         title=resume_data.get("title", ""),
         summary=resume_data.get("summary", ""),
@@ -45,11 +88,191 @@ def save_resume_as_pdf(name, resume_data, directory="output/resumes"):
         awards=resume_data.get("awards", [])
     )
 
-    # Create safe file path
-    safe_name = sanitize_filename(name)
-    pdf_path = os.path.join(directory, f"{safe_name}_Resume.pdf")
 
-    # Generate PDF using pdfkit
-    pdfkit.from_string(html_out, pdf_path, configuration=pdfkit_config)
+def resume_pdf_path(name, directory="output/resumes"):
+    return os.path.join(directory, f"{sanitize_filename(name)}_Resume.pdf")
 
+
+def _unique_pdf_path(name, directory, used_paths):
+    pdf_path = resume_pdf_path(name, directory)
+    suffix = 2
+    while pdf_path in used_paths:
+        pdf_path = os.path.join(directory, f"{sanitize_filename(name)}_{suffix}_Resume.pdf")
+        suffix += 1
+    used_paths.add(pdf_path)
     return pdf_path
+
+
+# ------------------------
+# Renderer Backends
+# ------------------------
+# A backend renders one resume to a file (render) and many resumes into a
+# single document (render_combined). fingerprint() identifies its layout, so
+# PDFs rendered with an unchanged layout can be reused.
+
+@lru_cache(maxsize=None)
+def _module_fingerprint(path):
+    return file_fingerprint(path)
+
+
+class WkhtmltopdfBackend:
+    """HTML template rendered by wkhtmltopdf; pdfkit and the binary are loaded on first use."""
+
+    name = "wkhtmltopdf"
+
+    def __init__(self, path=None):
+        self.path = path
+        self._config = None
+        self._lock = threading.Lock()
+
+    def is_available(self):
+        path = self.path or WKHTMLTOPDF_PATH or default_wkhtmltopdf_path()
+        return bool(path) and os.path.exists(path)
+
+    def _pdfkit(self):
+        import pdfkit
+
+        with self._lock:
+            if self._config is None:
+                path = self.path or WKHTMLTOPDF_PATH or default_wkhtmltopdf_path()
+                if not path or not os.path.exists(path):
+                    raise OSError(f"wkhtmltopdf not found at: {path}")
+                self._config = pdfkit.configuration(wkhtmltopdf=path)
+        return pdfkit, self._config
+
+    def render(self, name, resume_data, pdf_path):
+        pdfkit, config = self._pdfkit()
+        with span("pdf.template"):
+            html = render_resume_html(name, resume_data)
+        with span("pdf.wkhtmltopdf"):
+            pdfkit.from_string(html, pdf_path, configuration=config)
+        return pdf_path
+
+    def fingerprint(self):
+        return f"{self.name}:{template_fingerprint()}"
+
+    def render_combined(self, resumes, pdf_path):
+        # wkhtmltopdf starts each input document on a new page, so every candidate gets their own page
+        pdfkit, config = self._pdfkit()
+        with tempfile.TemporaryDirectory(prefix="fakehr_resumes_") as tmp_dir:
+            html_paths = []
+            with span("pdf.template", combined=True):
+                for index, (name, resume_data) in enumerate(resumes):
+                    html_path = os.path.join(tmp_dir, f"{index:05d}.html")
+                    with open(html_path, "w", encoding="utf-8") as f:
+                        f.write(render_resume_html(name, resume_data))
+                    html_paths.append(html_path)
+            if not html_paths:
+                return None
+            with span("pdf.wkhtmltopdf", combined=True):
+                pdfkit.from_file(html_paths, pdf_path, configuration=config)
+        return pdf_path
+
+
+class NativeBackend:
+    """Draws the resume layout directly to PDF in-process (see pdf_native)."""
+
+    name = "native"
+
+    def is_available(self):
+        return True
+
+    def render(self, name, resume_data, pdf_path):
+        with span("pdf.native"):
+            return pdf_native.save_resume_pdf(name, resume_data, pdf_path)
+
+    def fingerprint(self):
+        # The layout is the pdf_native code loaded in this process, so it is hashed once
+        return f"{self.name}:{_module_fingerprint(pdf_native.__file__)}"
+
+    def render_combined(self, resumes, pdf_path):
+        resumes = list(resumes)
+        if not resumes:
+            return None
+        with span("pdf.native", combined=True):
+            return pdf_native.save_combined_pdf(resumes, pdf_path)
+
+
+PDF_BACKENDS = {
+    "wkhtmltopdf": WkhtmltopdfBackend(),
+    "native": NativeBackend(),
+}
+
+
+def register_pdf_backend(name, backend):
+    PDF_BACKENDS[name] = backend
+
+
+def get_pdf_backend(name=None):
+    name = name or PDF_BACKEND
+    if name == "auto":
+        name = "wkhtmltopdf" if PDF_BACKENDS["wkhtmltopdf"].is_available() else "native"
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend: {name}")
+    return PDF_BACKENDS[name]
+
+
+def save_resume_as_pdf(name, resume_data, directory="output/resumes", backend=None):
+    os.makedirs(directory, exist_ok=True)
+    renderer = get_pdf_backend(backend)
+    with span("pdf.save_resume", backend=renderer.name):
+        return renderer.render(name, resume_data, resume_pdf_path(name, directory))
+
+
+def get_render_pool():
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix="pdf-render")
+        return _render_pool
+
+
+def save_resumes_as_pdfs(resumes, directory="output/resumes", zip_path=None, backend=None):
+    """Render many (name, resume_data) pairs on the render pool.
+
+    Returns one (pdf_path, error) tuple per input, in input order. Duplicate names get a
+    numeric suffix so concurrent renders never write to the same file. With zip_path, each
+    PDF is appended to that archive on disk as soon as it finishes rendering.
+    """
+    os.makedirs(directory, exist_ok=True)
+    renderer = get_pdf_backend(backend)
+    pool = get_render_pool()
+
+    futures = {}
+    used_paths = set()
+    for index, (name, resume_data) in enumerate(resumes):
+        pdf_path = _unique_pdf_path(name, directory, used_paths)
+        futures[pool.submit(renderer.render, name, resume_data, pdf_path)] = index
+
+    results = [None] * len(futures)
+    zipf = None
+    if zip_path:
+        os.makedirs(os.path.dirname(zip_path) or ".", exist_ok=True)
+        tmp_zip_path = f"{zip_path}.tmp"
+        zipf = zipfile.ZipFile(tmp_zip_path, "w")
+
+    try:
+        for future in as_completed(futures):
+            try:
+                pdf_path = future.result()
+            except Exception as e:
+                results[futures[future]] = (None, e)
+                continue
+            if zipf is not None:
+                # ZipFile.write copies from the file in small blocks, so nothing is buffered whole
+                with span("pdf.zip_add"):
+                    zipf.write(pdf_path, arcname=os.path.basename(pdf_path))
+            results[futures[future]] = (pdf_path, None)
+    finally:
+        if zipf is not None:
+            zipf.close()
+
+    if zipf is not None:
+        os.replace(tmp_zip_path, zip_path)
+    return results
+
+
+def save_resumes_as_combined_pdf(resumes, pdf_path, backend=None):
+    """Render every (name, resume_data) pair into one PDF, one candidate per page, in one renderer run."""
+    os.makedirs(os.path.dirname(pdf_path) or ".", exist_ok=True)
+    return get_pdf_backend(backend).render_combined(resumes, pdf_path)
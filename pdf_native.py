@@ -0,0 +1,204 @@
+import zlib
+
+from telemetry import span
+
+# ------------------------
+# Minimal PDF Writer
+# ------------------------
+# Draws the resume layout straight to PDF with the standard Helvetica fonts, so
+# no external renderer process is needed. Only what the resume template uses is
+# supported: headings, paragraphs, bullet lists and section rules.
+
+PAGE_WIDTH = 595  # A4 in points
+PAGE_HEIGHT = 842
+MARGIN = 50
+
+# Helvetica advance widths (1/1000 em) for ASCII 32..126
+_HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+_DEFAULT_WIDTH = 556
+_BOLD_FACTOR = 1.06  # Helvetica-Bold is slightly wider; close enough for wrapping
+
+FONTS = {"regular": "F1", "bold": "F2"}
+
+
+def text_width(text, size, bold=False):
+    units = sum(
+        _HELVETICA_WIDTHS[ord(ch) - 32] if 32 <= ord(ch) <= 126 else _DEFAULT_WIDTH
+        for ch in text
+    )
+    return units * size / 1000 * (_BOLD_FACTOR if bold else 1)
+
+
+def wrap_text(text, size, max_width, bold=False):
+    lines = []
+    for paragraph in str(text).splitlines() or [""]:
+        line = ""
+        for word in paragraph.split():
+            candidate = f"{line} {word}" if line else word
+            if line and text_width(candidate, size, bold) > max_width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return lines
+
+
+def _escape(text):
+    encoded = text.encode("cp1252", errors="replace").decode("latin-1")
+    return encoded.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+class PdfDocument:
+    """Collects page content streams and writes them as one PDF file."""
+
+    def __init__(self):
+        self.pages = []
+        self._ops = None
+        self.y = 0
+
+    # --- layout ---
+
+    def new_page(self):
+        self._ops = []
+        self.pages.append(self._ops)
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def _ensure_space(self, height):
+        if self._ops is None or self.y - height < MARGIN:
+            self.new_page()
+
+    def text_line(self, text, size, x=MARGIN, bold=False):
+        self._ensure_space(size * 1.4)
+        self.y -= size * 1.2
+        self._ops.append(
+            f"BT /{FONTS['bold' if bold else 'regular']} {size:g} Tf {x:.2f} {self.y:.2f} Td ({_escape(text)}) Tj ET"
+        )
+        self.y -= size * 0.2
+
+    def paragraph(self, text, size=10.5, x=MARGIN, bold=False):
+        for line in wrap_text(text, size, PAGE_WIDTH - MARGIN - x, bold):
+            self.text_line(line, size, x, bold)
+
+    def bullet_list(self, items, size=10.5):
+        indent = MARGIN + 14
+        for item in items:
+            lines = wrap_text(item, size, PAGE_WIDTH - MARGIN - indent)
+            for index, line in enumerate(lines):
+                self._ensure_space(size * 1.4)
+                if index == 0:
+                    self._ops.append(
+                        f"BT /{FONTS['regular']} {size:g} Tf {MARGIN + 4:.2f} {self.y - size * 1.2:.2f} Td (-) Tj ET"
+                    )
+                self.text_line(line, size, indent)
+
+    def heading(self, text, size=12):
+        self._ensure_space(size * 4)
+        self.y -= size * 0.8
+        self.text_line(text, size, bold=True)
+        self._ops.append(f"0.8 G 0.75 w {MARGIN} {self.y:.2f} m {PAGE_WIDTH - MARGIN} {self.y:.2f} l S 0 G")
+        self.y -= size * 0.4
+
+    # --- output ---
+
+    def write(self, path):
+        objects = [
+            "<< /Type /Catalog /Pages 2 0 R >>",
+            None,  # page tree, filled in once the page objects are numbered
+            "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+            "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+        ]
+        page_ids = []
+        for ops in self.pages or [[]]:
+            stream = zlib.compress("\n".join(ops).encode("latin-1"))
+            objects.append((f"<< /Length {len(stream)} /Filter /FlateDecode >>", stream))
+            content_id = len(objects)
+            objects.append(
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {content_id} 0 R >>"
+            )
+            page_ids.append(len(objects))
+        kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+        objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>"
+
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, obj in enumerate(objects, 1):
+            offsets.append(len(out))
+            out += f"{number} 0 obj\n".encode()
+            if isinstance(obj, tuple):
+                out += obj[0].encode() + b"\nstream\n" + obj[1] + b"\nendstream"
+            else:
+                out += obj.encode()
+            out += b"\nendobj\n"
+
+        xref_offset = len(out)
+        out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+        for offset in offsets:
+            out += f"{offset:010d} 00000 n \n".encode()
+        out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+
+        with span("pdf.write_file"), open(path, "wb") as f:
+            f.write(out)
+        return path
+
+
+# ------------------------
+# Resume Layout
+# ------------------------
+
+def _as_list(value):
+    return [value] if isinstance(value, str) else [str(item) for item in value]
+
+
+def _as_text(value):
+    return value if isinstance(value, str) else ", ".join(str(item) for item in value)
+
+
+def draw_resume(doc, name, resume_data):
+    # Same sections, in the same order, as templates/resume_template.html
+    doc.new_page()
+    doc.paragraph(name, size=20, bold=True)
+    if resume_data.get("title"):
+        doc.paragraph(resume_data["title"], size=12, bold=True)
+    if resume_data.get("summary"):
+        doc.paragraph(_as_text(resume_data["summary"]))
+
+    for heading, key in [("Skills", "skills"), ("Experience", "experience")]:
+        if resume_data.get(key):
+            doc.heading(heading)
+            doc.bullet_list(_as_list(resume_data[key]))
+
+    for heading, key in [("Education", "education"), ("Certifications", "certifications")]:
+        if resume_data.get(key):
+            doc.heading(heading)
+            doc.paragraph(_as_text(resume_data[key]))
+
+    for heading, key in [("Languages", "languages"), ("Projects", "projects"), ("Awards", "awards")]:
+        if resume_data.get(key):
+            doc.heading(heading)
+            doc.bullet_list(_as_list(resume_data[key]))
+
+    if resume_data.get("contact"):
+        doc.heading("Contact")
+        doc.paragraph(resume_data["contact"])
+
+
+def save_resume_pdf(name, resume_data, pdf_path):
+    doc = PdfDocument()
+    draw_resume(doc, name, resume_data)
+    return doc.write(pdf_path)
+
+
+def save_combined_pdf(resumes, pdf_path):
+    doc = PdfDocument()
+    for name, resume_data in resumes:
+        draw_resume(doc, name, resume_data)
+    return doc.write(pdf_path)
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+CACHE_DB_FILE = os.path.join("output", "cache", "gemini_cache.db")
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+def canonicalize_fields(fields):
+    # Same candidate, same key: sorted keys, stringified and trimmed values
+    return {str(key).strip(): str(value).strip() for key, value in sorted(fields.items(), key=lambda item: str(item[0]))}
+
+
+def resume_cache_key(prompt, model_name):
+    return hashlib.sha256(f"{model_name}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+class ResumeCache:
+    """SQLite-backed cache of model responses with a TTL and LRU eviction."""
+
+    def __init__(self, path=CACHE_DB_FILE, ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS resume_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT,
+                created_at REAL,
+                last_used REAL
+            )''')
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_resume_cache_last_used ON resume_cache (last_used)")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT response, created_at FROM resume_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or (self.ttl_seconds and now - row[1] > self.ttl_seconds):
+                if row is not None:
+                    conn.execute("DELETE FROM resume_cache WHERE key = ?", (key,))
+                    conn.commit()
+                self.misses += 1
+                return None
+            conn.execute("UPDATE resume_cache SET last_used = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def contains(self, key):
+        # Unlike get(), touches neither the LRU order nor the hit counters
+        with self._lock:
+            row = self._connect().execute("SELECT created_at FROM resume_cache WHERE key = ?", (key,)).fetchone()
+        return row is not None and not (self.ttl_seconds and time.time() - row[0] > self.ttl_seconds)
+
+    def set(self, key, model_name, resume_data):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO resume_cache (key, model, response, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, model_name, json.dumps(resume_data), now, now)
+            )
+            # Evict least recently used entries beyond the size bound
+            overflow = conn.execute("SELECT COUNT(*) FROM resume_cache").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM resume_cache WHERE key IN (SELECT key FROM resume_cache ORDER BY last_used LIMIT ?)",
+                    (overflow,)
+                )
+            conn.commit()
+
+    def stats(self):
+        with self._lock:
+            entries = self._connect().execute("SELECT COUNT(*) FROM resume_cache").fetchone()[0]
+            return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM resume_cache")
+            conn.commit()
+            self.hits = 0
+            self.misses = 0
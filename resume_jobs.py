@@ -0,0 +1,497 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import socket
+import threading
+import time
+import uuid
+import zipfile
+from contextlib import contextmanager
+from datetime import datetime
+
+import database
+from database import get_connection
+from telemetry import span
+
+logger = logging.getLogger(__name__)
+
+# ------------------------
+# Bulk Resume Job Queue
+# ------------------------
+# A job is stored as one task row per candidate in SQLite. Worker threads claim
+# pending tasks a group at a time (one batched Gemini request per group), render
+# the PDFs and mark each task done in its own commit. A claim is a lease under a
+# token unique to that claim, renewed by a heartbeat while the group is worked
+# on: tasks left "running" by a crashed or restarted process become claimable
+# again once the lease expires, and "done" tasks are never picked up again. When a job has
+# no open tasks left, one worker builds its ZIP / combined PDF and records it in
+# the generation history.
+#
+# Finished tasks keep two fingerprints: resume_fingerprint over the prompt fields
+# and the model (set only for real model responses), and render_fingerprint over
+# the rendered resume and the PDF layout. A new job reuses the user's earlier
+# outputs stage by stage: an unchanged candidate is copied as done, and one whose
+# template or contact details changed is only re-rendered, without an LLM call.
+
+JOBS_DIR = os.path.join("output", "jobs")
+JOB_WORKERS = 4
+LEASE_SECONDS = 300
+MAX_ATTEMPTS = 3
+POLL_SECONDS = 2.0
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+# A job is "submitting" while its reused PDFs are copied; workers only look at running jobs
+JOB_SUBMITTING, JOB_RUNNING, JOB_FINALIZING, JOB_DONE = "submitting", "running", "finalizing", "done"
+
+
+def _now():
+    return time.time()
+
+
+def job_dir(job_id):
+    return os.path.join(JOBS_DIR, str(job_id))
+
+
+# ------------------------
+# Queue Storage
+# ------------------------
+
+def _render_fingerprint(name, resume_data, renderer):
+    # None for backends that cannot fingerprint their layout; their PDFs are always rendered again
+    layout = getattr(renderer, "fingerprint", None)
+    if layout is None:
+        return None
+    payload = json.dumps({"name": name, "resume": resume_data, "layout": layout()}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _previous_outputs(conn, username, fingerprints):
+    """The user's latest finished task per resume fingerprint."""
+    fingerprints = list(set(fingerprints))
+    previous = {}
+    for start in range(0, len(fingerprints), 500):
+        chunk = fingerprints[start:start + 500]
+        rows = conn.execute(
+            "SELECT t.resume_fingerprint, t.resume, t.render_fingerprint, t.pdf_path FROM resume_tasks t "
+            "JOIN resume_jobs j ON j.id = t.job_id "
+            f"WHERE t.resume_fingerprint IN ({', '.join('?' * len(chunk))}) AND t.status = ? AND j.username = ? "
+            "ORDER BY t.id",
+            (*chunk, DONE, username)
+        ).fetchall()
+        for fingerprint, resume, render_fingerprint, pdf_path in rows:
+            previous[fingerprint] = {"resume": json.loads(resume), "render_fingerprint": render_fingerprint,
+                                     "pdf_path": pdf_path}
+    return previous
+
+
+def submit_resume_job(username, candidates, combine_pdf=False):
+    """Queue one task per (position, row_data, prompt_fields) and return the job id.
+
+    Candidates matching one of the user's earlier tasks skip the LLM, or both the LLM
+    and rendering, when those inputs are unchanged (see the fingerprints above).
+    """
+    from gemini_resume import resume_fingerprint
+    from generate_pdf import get_pdf_backend
+
+    candidates = list(candidates)
+    renderer = get_pdf_backend()
+    fingerprints = [resume_fingerprint(prompt_fields) for _, _, prompt_fields in candidates]
+
+    with get_connection() as conn, span("jobs.match_previous"):
+        previous = _previous_outputs(conn, username, fingerprints)
+    plans = []
+    for (position, row_data, prompt_fields), fingerprint in zip(candidates, fingerprints):
+        prior = previous.get(fingerprint)
+        resume_data = render_fingerprint = source_pdf = None
+        if prior:
+            resume_data = prior["resume"]
+            render_fingerprint = _render_fingerprint(
+                row_data["name"], _render_job_resume(row_data, prompt_fields, resume_data), renderer
+            )
+            if (render_fingerprint and render_fingerprint == prior["render_fingerprint"]
+                    and prior["pdf_path"] and os.path.exists(prior["pdf_path"])):
+                source_pdf = prior["pdf_path"]
+        plans.append((position, row_data, prompt_fields, fingerprint, resume_data, render_fingerprint, source_pdf))
+
+    reused = sum(1 for *_, source_pdf in plans if source_pdf)
+    rerendered = sum(1 for *_, resume_data, _, source_pdf in plans if resume_data is not None and not source_pdf)
+    options = {"combine_pdf": bool(combine_pdf), "reused": reused, "rerendered": rerendered}
+    with get_connection() as conn, conn:
+        job_id = conn.execute(
+            "INSERT INTO resume_jobs (username, status, total, options, created_at) VALUES (?, ?, ?, ?, ?)",
+            (username, JOB_SUBMITTING, len(candidates), json.dumps(options),
+             datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        ).lastrowid
+
+    # Files are copied outside any write transaction, so workers and other writers are never blocked on them
+    rows = []
+    for position, row_data, prompt_fields, fingerprint, resume_data, render_fingerprint, source_pdf in plans:
+        status, pdf_path = PENDING, None
+        if source_pdf:
+            # Copied so every job directory stays complete on its own
+            pdf_path = _task_pdf_path(job_id, position, row_data["name"])
+            os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
+            with span("jobs.reuse_pdf"):
+                shutil.copyfile(source_pdf, pdf_path)
+            status = DONE
+        rows.append((
+            job_id, position, row_data["name"], json.dumps(row_data, default=str),
+            json.dumps(prompt_fields, default=str), status,
+            json.dumps(resume_data) if resume_data is not None else None,
+            fingerprint if resume_data is not None else None,
+            render_fingerprint if source_pdf else None, pdf_path
+        ))
+
+    with get_connection() as conn, conn:
+        conn.executemany(
+            "INSERT INTO resume_tasks (job_id, position, name, row_data, prompt_fields, status, resume, "
+            "resume_fingerprint, render_fingerprint, pdf_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        conn.execute("UPDATE resume_jobs SET status = ? WHERE id = ?", (JOB_RUNNING, job_id))
+    get_runner().wake()
+    return job_id
+
+
+def get_job(job_id):
+    with get_connection() as conn:
+        row = conn.execute(
+            "SELECT id, username, status, total, options, zip_path, combined_pdf_path, created_at, finished_at "
+            "FROM resume_jobs WHERE id = ?",
+            (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        counts = dict(conn.execute(
+            "SELECT status, COUNT(*) FROM resume_tasks WHERE job_id = ? GROUP BY status", (job_id,)
+        ).fetchall())
+    keys = ["id", "username", "status", "total", "options", "zip_path", "combined_pdf_path", "created_at", "finished_at"]
+    job = dict(zip(keys, row))
+    job["options"] = json.loads(job["options"] or "{}")
+    job["counts"] = {status: counts.get(status, 0) for status in (PENDING, RUNNING, DONE, FAILED)}
+    return job
+
+
+def latest_job_id(username):
+    with get_connection() as conn:
+        row = conn.execute("SELECT id FROM resume_jobs WHERE username = ? ORDER BY id DESC LIMIT 1",
+                           (username,)).fetchone()
+    return row[0] if row else None
+
+
+def get_job_tasks(job_id):
+    """Every task of a job in submission order, with its row, resume and PDF path decoded."""
+    with get_connection() as conn:
+        rows = conn.execute(
+            "SELECT position, name, row_data, prompt_fields, status, resume, pdf_path, error "
+            "FROM resume_tasks WHERE job_id = ? ORDER BY position",
+            (job_id,)
+        ).fetchall()
+    return [
+        {
+            "position": position,
+            "name": name,
+            "row": json.loads(row_data),
+            "prompt_fields": json.loads(prompt_fields),
+            "status": status,
+            "resume": json.loads(resume) if resume else None,
+            "pdf_path": pdf_path,
+            "error": error,
+        }
+        for position, name, row_data, prompt_fields, status, resume, pdf_path, error in rows
+    ]
+
+
+def claim_tasks(owner, limit):
+    """Lease up to limit claimable tasks of one job under a new claim token derived from owner.
+
+    Returns (claim, [(id, job_id, position, name, row, fields, resume)]); resume is set for tasks that
+    only need rendering. The claim, not owner, identifies the lease holder in the calls below.
+    """
+    claim = f"{owner}:{uuid.uuid4().hex[:12]}"
+    now = _now()
+    expired = now - LEASE_SECONDS
+    with get_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # A task whose lease ran out MAX_ATTEMPTS times keeps crashing its worker; stop retrying it
+            conn.execute(
+                "UPDATE resume_tasks SET status = ?, error = ? WHERE status = ? AND claimed_at < ? AND attempts >= ?",
+                (FAILED, f"Gave up after {MAX_ATTEMPTS} attempts", RUNNING, expired, MAX_ATTEMPTS)
+            )
+            first = conn.execute(
+                "SELECT job_id FROM resume_tasks WHERE status = ? OR (status = ? AND claimed_at < ?) "
+                "ORDER BY job_id, position LIMIT 1",
+                (PENDING, RUNNING, expired)
+            ).fetchone()
+            if first is None:
+                conn.commit()
+                return claim, []
+            rows = conn.execute(
+                "SELECT id, job_id, position, name, row_data, prompt_fields, resume FROM resume_tasks "
+                "WHERE job_id = ? AND (status = ? OR (status = ? AND claimed_at < ?)) ORDER BY position LIMIT ?",
+                (first[0], PENDING, RUNNING, expired, limit)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE resume_tasks SET status = ?, claimed_by = ?, claimed_at = ?, attempts = attempts + 1 WHERE id = ?",
+                [(RUNNING, claim, now, row[0]) for row in rows]
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return claim, [(task_id, job_id, position, name, json.loads(row_data), json.loads(prompt_fields),
+                    json.loads(resume) if resume else None)
+                   for task_id, job_id, position, name, row_data, prompt_fields, resume in rows]
+
+
+def renew_lease(claim, task_ids):
+    with get_connection() as conn, conn:
+        conn.executemany("UPDATE resume_tasks SET claimed_at = ? WHERE id = ? AND status = ? AND claimed_by = ?",
+                         [(_now(), task_id, RUNNING, claim) for task_id in task_ids])
+
+
+@contextmanager
+def lease_heartbeat(claim, task_ids, interval=LEASE_SECONDS / 3):
+    """Renew the lease every interval seconds while the block runs, e.g. through long quota backoffs."""
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(interval):
+            try:
+                renew_lease(claim, task_ids)
+            except Exception:
+                logger.exception("Could not renew the lease of claim %s", claim)
+
+    thread = threading.Thread(target=beat, name="resume-job-lease", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def complete_task(claim, task_id, resume_data, pdf_path, resume_fingerprint=None, render_fingerprint=None):
+    # Only the current claim can finish a task, so a task is completed exactly once.
+    # A render-only task keeps the resume fingerprint it was queued with.
+    with get_connection() as conn, conn:
+        conn.execute(
+            "UPDATE resume_tasks SET status = ?, resume = ?, pdf_path = ?, error = NULL, "
+            "resume_fingerprint = COALESCE(?, resume_fingerprint), render_fingerprint = ? "
+            "WHERE id = ? AND status = ? AND claimed_by = ?",
+            (DONE, json.dumps(resume_data), pdf_path, resume_fingerprint, render_fingerprint, task_id, RUNNING, claim)
+        )
+
+
+def fail_task(claim, task_id, error):
+    # Back to pending until MAX_ATTEMPTS, then failed for good
+    with get_connection() as conn, conn:
+        conn.execute(
+            "UPDATE resume_tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, error = ? "
+            "WHERE id = ? AND status = ? AND claimed_by = ?",
+            (MAX_ATTEMPTS, FAILED, PENDING, str(error), task_id, RUNNING, claim)
+        )
+
+
+def _claim_finished_jobs():
+    """Mark jobs with no open tasks as finalizing and return their ids (stale finalizations are retaken)."""
+    now = _now()
+    with get_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            job_ids = [row[0] for row in conn.execute(
+                "SELECT id FROM resume_jobs j WHERE (status = ? OR (status = ? AND claimed_at < ?)) "
+                "AND NOT EXISTS (SELECT 1 FROM resume_tasks t WHERE t.job_id = j.id AND t.status IN (?, ?))",
+                (JOB_RUNNING, JOB_FINALIZING, now - LEASE_SECONDS, PENDING, RUNNING)
+            ).fetchall()]
+            conn.executemany("UPDATE resume_jobs SET status = ?, claimed_at = ? WHERE id = ?",
+                             [(JOB_FINALIZING, now, job_id) for job_id in job_ids])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return job_ids
+
+
+# ------------------------
+# Workers
+# ------------------------
+
+def _render_job_resume(row_data, prompt_fields, resume_data):
+    from gemini_resume import resume_contact
+
+    return {
+        **resume_data,
+        "title": prompt_fields.get("Job Title", ""),
+        "contact": resume_contact(row_data)
+    }
+
+
+def _task_pdf_path(job_id, position, name):
+    from generate_pdf import sanitize_filename
+
+    # The position keeps duplicate names apart
+    return os.path.join(job_dir(job_id), "resumes", f"{sanitize_filename(name)}_{position}_Resume.pdf")
+
+
+def finalize_job(job_id):
+    from generate_pdf import save_resumes_as_combined_pdf
+
+    job = get_job(job_id)
+    tasks = [task for task in get_job_tasks(job_id) if task["status"] == DONE and task["pdf_path"]]
+    directory = job_dir(job_id)
+    os.makedirs(directory, exist_ok=True)
+
+    zip_path = os.path.join(directory, "all_resumes.zip")
+    with span("jobs.zip"):
+        tmp_zip_path = f"{zip_path}.tmp"
+        with zipfile.ZipFile(tmp_zip_path, "w") as zipf:
+            for task in tasks:
+                if os.path.exists(task["pdf_path"]):
+                    zipf.write(task["pdf_path"], arcname=os.path.basename(task["pdf_path"]))
+        os.replace(tmp_zip_path, zip_path)
+
+    combined_pdf_path = None
+    if job["options"].get("combine_pdf") and tasks:
+        with span("jobs.combined_pdf"):
+            combined_pdf_path = save_resumes_as_combined_pdf(
+                [(task["name"], _render_job_resume(task["row"], task["prompt_fields"], task["resume"])) for task in tasks],
+                os.path.join(directory, "all_resumes.pdf")
+            )
+
+    with get_connection() as conn, conn:
+        updated = conn.execute(
+            "UPDATE resume_jobs SET status = ?, zip_path = ?, combined_pdf_path = ?, finished_at = ? "
+            "WHERE id = ? AND status = ?",
+            (JOB_DONE, zip_path, combined_pdf_path, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), job_id,
+             JOB_FINALIZING)
+        ).rowcount
+
+    if updated and tasks:
+        history_details = {
+            "count": len(tasks),
+            "names": [task["name"] for task in tasks],
+            "zip_path": zip_path
+        }
+        if combined_pdf_path:
+            history_details["combined_pdf_path"] = combined_pdf_path
+        database.save_generation_history(job["username"], "Resume", json.dumps(history_details))
+
+
+class ResumeJobRunner:
+    """Worker threads that drain the task table; one runner per process (see get_runner)."""
+
+    def __init__(self, workers=JOB_WORKERS, requests_per_minute=None):
+        from gemini_resume import REQUESTS_PER_MINUTE, TokenBucket
+
+        self.workers = workers
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.rate_limiter = TokenBucket(requests_per_minute or REQUESTS_PER_MINUTE)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        database.init_db()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"resume-job-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self):
+        from gemini_resume import CANDIDATES_PER_REQUEST
+
+        while not self._stop.is_set():
+            try:
+                with span("jobs.claim"):
+                    claim, tasks = claim_tasks(self.owner, CANDIDATES_PER_REQUEST)
+                if tasks:
+                    with lease_heartbeat(claim, [task[0] for task in tasks]):
+                        self._process(claim, tasks)
+                    continue
+                for job_id in _claim_finished_jobs():
+                    with span("jobs.finalize"):
+                        finalize_job(job_id)
+            except Exception:
+                logger.exception("Resume job worker error")
+            self._wake.wait(POLL_SECONDS)
+            self._wake.clear()
+
+    def _process(self, claim, tasks):
+        from gemini_resume import (MAX_RETRIES, generate_resume_group_with_gemini, is_error_resume, resume_cache,
+                                   resume_fingerprint)
+        from generate_pdf import get_pdf_backend
+
+        # Tasks queued with a reused resume go straight to rendering
+        resumes = [task[-1] for task in tasks]
+        fingerprints = [None] * len(tasks)
+        pending = [index for index, resume_data in enumerate(resumes) if resume_data is None]
+        if pending:
+            try:
+                with span("jobs.llm"):
+                    generated = generate_resume_group_with_gemini([tasks[index][5] for index in pending],
+                                                                  rate_limiter=self.rate_limiter,
+                                                                  max_retries=MAX_RETRIES)
+            except Exception as e:
+                for index in pending:
+                    fail_task(claim, tasks[index][0], e)
+                generated = []
+            for index, resume_data in zip(pending, generated):
+                if is_error_resume(resume_data):
+                    # Back to pending for another attempt instead of a PDF of the error
+                    error = resume_data.get("error") if isinstance(resume_data, dict) else None
+                    fail_task(claim, tasks[index][0], error or "Invalid resume")
+                    continue
+                resumes[index] = resume_data
+                # Only model responses reach the cache; a fallback or error resume is asked for again next time
+                fingerprint = resume_fingerprint(tasks[index][5])
+                fingerprints[index] = fingerprint if resume_cache.contains(fingerprint) else None
+
+        renderer = get_pdf_backend()
+        for (task_id, job_id, position, name, row_data, prompt_fields, _), resume_data, fingerprint in zip(
+                tasks, resumes, fingerprints):
+            if resume_data is None:
+                continue  # failed above
+            tmp_path = None
+            try:
+                pdf_path = _task_pdf_path(job_id, position, name)
+                os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
+                rendered = _render_job_resume(row_data, prompt_fields, resume_data)
+                # Rendered under the claim's own name, so a stale holder never writes a half file into place
+                tmp_path = f"{os.path.splitext(pdf_path)[0]}.{claim.rsplit(':', 1)[-1]}.tmp.pdf"
+                with span("jobs.render"):
+                    renderer.render(name, rendered, tmp_path)
+                os.replace(tmp_path, pdf_path)
+            except Exception as e:
+                fail_task(claim, task_id, e)
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                continue
+            complete_task(claim, task_id, resume_data, pdf_path, fingerprint,
+                          _render_fingerprint(name, rendered, renderer))
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_runner():
+    """The process-wide runner, started on first use; it also picks up jobs left over from earlier runs."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = ResumeJobRunner().start()
+        return _runner
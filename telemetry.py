@@ -0,0 +1,185 @@
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+logger = logging.getLogger("fakehr.telemetry")
+
+# ------------------------
+# Stage Timing
+# ------------------------
+# span("stage") times a block and adds the duration to a per-stage histogram.
+# Histograms live in this process only (generator worker processes keep their
+# own), and can be read as a snapshot or in Prometheus text format. Each span
+# is also logged as one JSON line at DEBUG level.
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_NAME = "fakehr_stage_duration_seconds"
+
+# Set to serve /metrics over HTTP alongside the app (see start_metrics_server)
+METRICS_PORT = os.environ.get("FAKEHR_METRICS_PORT")
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+_histograms = {}
+_lock = threading.Lock()
+
+
+def _key(name, labels):
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def observe(name, seconds, **labels):
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(seconds)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(json.dumps({"span": name, "seconds": round(seconds, 6), **labels}, default=str))
+
+
+@contextmanager
+def span(name, **labels):
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        observe(name, time.perf_counter() - start, status="error", **labels)
+        raise
+    observe(name, time.perf_counter() - start, **labels)
+
+
+def traced(name, **labels):
+    """Decorator form of span()."""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def snapshot():
+    """One dict per (stage, labels), slowest total first."""
+    with _lock:
+        items = [(key, histogram) for key, histogram in _histograms.items()]
+        rows = [
+            {
+                "stage": name,
+                "labels": dict(labels),
+                "count": histogram.count,
+                "total_s": histogram.sum,
+                "mean_s": histogram.sum / histogram.count,
+                "p50_s": histogram.quantile(0.5),
+                "p95_s": histogram.quantile(0.95),
+                "max_s": histogram.max,
+            }
+            for (name, labels), histogram in items
+        ]
+    return sorted(rows, key=lambda row: row["total_s"], reverse=True)
+
+
+def _label_text(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+def render_prometheus():
+    lines = [
+        f"# HELP {METRIC_NAME} Time spent per stage.",
+        f"# TYPE {METRIC_NAME} histogram",
+    ]
+    with _lock:
+        for (name, labels), histogram in sorted(_histograms.items()):
+            labels = (("stage", name),) + labels
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f"{METRIC_NAME}_bucket{_label_text(labels, le=f'{bound:g}')} {cumulative}")
+            lines.append(f"{METRIC_NAME}_bucket{_label_text(labels, le='+Inf')} {histogram.count}")
+            lines.append(f"{METRIC_NAME}_sum{_label_text(labels)} {histogram.sum:.6f}")
+            lines.append(f"{METRIC_NAME}_count{_label_text(labels)} {histogram.count}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+# ------------------------
+# /metrics Endpoint
+# ------------------------
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=None, host="0.0.0.0"):
+    """Serve render_prometheus() at /metrics from a daemon thread; starts at most once per process."""
+    global _server
+    port = int(port or METRICS_PORT or 0)
+    if not port:
+        return None
+
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), MetricsHandler)
+            except OSError:
+                logger.exception("Could not start the metrics server on port %s", port)
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
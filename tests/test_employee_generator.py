@@ -0,0 +1,86 @@
+import hashlib
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+from employee_generator import DEFAULT_SHARD_SIZE, generate_employee_data, iter_employee_data
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIELDS = ["name", "phone", "country", "email"]
+
+_PROBE = """
+import hashlib
+from employee_generator import generate_employee_data
+df = generate_employee_data(2000, {fields!r}, [], seed=7, workers={workers})
+print(hashlib.sha256(df.to_csv(index=False).encode()).hexdigest())
+"""
+
+
+def _fresh_interpreter_digest(workers=1):
+    # Each run gets its own string hash seed, like separate CLI invocations
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONHASHSEED"}
+    out = subprocess.run([sys.executable, "-c", _PROBE.format(fields=FIELDS, workers=workers)],
+                         cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return out.stdout.strip().splitlines()[-1]
+
+
+def test_seeded_output_matches_across_interpreters():
+    digest = _fresh_interpreter_digest()
+    assert _fresh_interpreter_digest() == digest
+    assert _fresh_interpreter_digest(workers=2) == digest
+    df = generate_employee_data(2000, FIELDS, [], seed=7)
+    assert hashlib.sha256(df.to_csv(index=False).encode()).hexdigest() == digest
+
+
+def test_chunk_size_does_not_change_rows():
+    num_rows = DEFAULT_SHARD_SIZE + 2500
+    expected = generate_employee_data(num_rows, FIELDS, [], seed=42)
+    chunks = list(iter_employee_data(num_rows, FIELDS, [], chunk_size=7000, seed=42))
+
+    assert [len(chunk) for chunk in chunks] == [7000, 5500]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+
+def test_custom_fields_named_like_predefined_fields_use_custom_rules():
+    # No name/country/phone selected, so there are no countries for the predefined generators
+    df = generate_employee_data(50, ["email"], ["phone", "country", "name"], seed=3)
+
+    assert list(df.columns) == ["S.No", "email", "phone", "country", "name"]
+    for field in ["phone", "country", "name"]:
+        assert df[field].notna().all()
+        assert (df[field].str.len() > 0).all()
+
+
+_SPAWN_SCRIPT = """
+import multiprocessing
+import numpy as np
+from employee_generator import generate_employee_data, register_custom_field_rule, register_name_hints
+
+
+def department(faker, rng, size, countries):
+    return np.full(size, "ENG")
+
+
+if __name__ == "__main__":
+    multiprocessing.set_start_method("spawn")
+    register_custom_field_rule("dept", department)
+    register_name_hints("FR", ["an"])
+    single = generate_employee_data(3000, ["name", "country"], ["dept"], seed=5, workers=1)
+    spawned = generate_employee_data(3000, ["name", "country"], ["dept"], seed=5, workers=2)
+    assert (spawned["dept"] == "ENG").all(), spawned["dept"].head()
+    assert (spawned["country"] == "FR").any()
+    assert single.equals(spawned)
+    print("ok")
+"""
+
+
+def test_spawned_workers_see_registered_rules_and_hints(tmp_path):
+    script = tmp_path / "spawn_registries.py"
+    script.write_text(_SPAWN_SCRIPT, encoding="utf-8")
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    out = subprocess.run([sys.executable, str(script)], cwd=tmp_path, env=env, capture_output=True, text=True)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == "ok"
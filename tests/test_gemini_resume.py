@@ -0,0 +1,127 @@
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import gemini_resume
+from gemini_resume import TokenBucket, generate_resumes_batch, validate_resume
+
+
+class StubModel:
+    """Answers resume prompts locally; the summary names the candidate it was written for."""
+
+    model_name = "stub"
+
+    def __init__(self, error=None, latency_seconds=0.0):
+        self.error = error
+        self.latency_seconds = latency_seconds
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def resume(self, name):
+        return {
+            "summary": f"Resume for {name}, who exceeded their sales quota by 429 units.",
+            "experience": ["Led a team"],
+            "education": "B.Sc",
+            "certifications": "",
+            "skills": ["Python"],
+            "languages": ["English - Native"],
+            "projects": ["Migration"],
+            "awards": ["Employee of the Year"],
+        }
+
+    def generate_content(self, prompt):
+        with self._lock:
+            self.calls.append(time.monotonic())
+        if self.latency_seconds:
+            time.sleep(random.uniform(0, self.latency_seconds))
+        if self.error is not None:
+            raise self.error
+        batch = re.search(r"### Candidates:\n(.*?)\n\n### Output", prompt, re.S)
+        if batch:
+            items = [{"id": c["id"], **self.resume(c["name"])} for c in json.loads(batch.group(1))]
+            return SimpleNamespace(text=json.dumps(items))
+        fields = json.loads(re.search(r"### Candidate Details:\n(.*?)\n\n### Output", prompt, re.S).group(1))
+        return SimpleNamespace(text=json.dumps(self.resume(fields["name"])))
+
+
+class QuotaError(Exception):
+    code = 429
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(gemini_resume, "backoff_delay", lambda attempt: 0)
+
+
+@pytest.mark.parametrize("candidates_per_request", [1, 3])
+def test_batch_keeps_input_order(candidates_per_request):
+    fields_list = [{"name": f"Candidate {index}"} for index in range(10)]
+    resumes = generate_resumes_batch(fields_list, model=StubModel(latency_seconds=0.02), cache=False,
+                                     requests_per_minute=None, candidates_per_request=candidates_per_request)
+
+    assert [resume["summary"].split(",")[0] for resume in resumes] == [
+        f"Resume for {fields['name']}" for fields in fields_list
+    ]
+    assert all(validate_resume(resume) for resume in resumes)
+
+
+def test_quota_error_is_retried_then_falls_back():
+    model = StubModel(error=QuotaError("Resource exhausted"))
+    resumes = generate_resumes_batch([{"name": "Ada"}], model=model, cache=False, requests_per_minute=None,
+                                     max_retries=2, candidates_per_request=1)
+
+    assert len(model.calls) == 3
+    assert validate_resume(resumes[0])
+    assert "Ada" in resumes[0]["summary"]
+    assert not resumes[0]["summary"].startswith("Error generating resume")
+
+
+def test_other_errors_are_not_retried():
+    model = StubModel(error=ValueError("bad request"))
+    resumes = generate_resumes_batch([{"name": "Ada"}], model=model, cache=False, requests_per_minute=None,
+                                     max_retries=4, candidates_per_request=1)
+
+    assert len(model.calls) == 1
+    assert resumes[0]["summary"] == "Error generating resume: bad request"
+
+
+def test_rate_limiter_spaces_requests(monkeypatch):
+    # One token of burst at 10 requests/s: requests start at least 0.1 s apart
+    monkeypatch.setattr(gemini_resume, "TokenBucket", lambda rate: TokenBucket(rate, capacity=1))
+    model = StubModel()
+    generate_resumes_batch([{"name": f"Candidate {index}"} for index in range(5)], model=model, cache=False,
+                           max_workers=4, requests_per_minute=600, candidates_per_request=1)
+
+    calls = sorted(model.calls)
+    gaps = [later - earlier for earlier, later in zip(calls, calls[1:])]
+    assert len(calls) == 5
+    assert min(gaps) >= 0.09
+
+
+def test_batch_quota_error_falls_back_without_single_requests():
+    model = StubModel(error=QuotaError("Resource exhausted"))
+    resumes = generate_resumes_batch([{"name": f"Candidate {index}"} for index in range(5)], model=model, cache=False,
+                                     requests_per_minute=None, max_retries=2, candidates_per_request=5)
+
+    assert len(model.calls) == 3
+    assert [resume["summary"].split(" is ")[0] for resume in resumes] == [f"Candidate {index}" for index in range(5)]
+
+
+def test_invalid_single_response_is_not_cached(tmp_path):
+    class ListModel(StubModel):
+        def generate_content(self, prompt):
+            self.calls.append(time.monotonic())
+            return SimpleNamespace(text='["not", "a", "resume"]')
+
+    cache = gemini_resume.ResumeCache(path=str(tmp_path / "cache.db"))
+    model = ListModel()
+    for _ in range(2):
+        resume = gemini_resume.generate_resume_with_gemini({"name": "Ada"}, model=model, cache=cache)
+        assert resume["summary"].startswith("Error generating resume")
+
+    assert len(model.calls) == 2
@@ -0,0 +1,110 @@
+import shutil
+import sqlite3
+import time
+
+import pytest
+
+import database
+import resume_jobs
+from resume_jobs import DONE, claim_tasks, complete_task, get_job_tasks, lease_heartbeat, submit_resume_job
+
+
+class IdleRunner:
+    def wake(self):
+        pass
+
+
+@pytest.fixture
+def job(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(database, "DB_FILE", str(tmp_path / "fakehr.db"))
+    monkeypatch.setattr(resume_jobs, "get_runner", IdleRunner)
+    database.init_db()
+    candidates = [(index, {"name": f"Person {index}"}, {"name": f"Person {index}"}) for index in range(2)]
+    return submit_resume_job("tester", candidates)
+
+
+def _claimed_at(task_id):
+    with database.get_connection() as conn:
+        return conn.execute("SELECT claimed_at FROM resume_tasks WHERE id = ?", (task_id,)).fetchone()[0]
+
+
+def test_stale_claim_cannot_complete_a_reclaimed_task(job, monkeypatch):
+    # Same owner (one runner process), two claims: the lease expired in between
+    monkeypatch.setattr(resume_jobs, "LEASE_SECONDS", -1)
+    first, tasks = claim_tasks("host:1", 2)
+    second, reclaimed = claim_tasks("host:1", 2)
+
+    assert first != second
+    assert [task[0] for task in reclaimed] == [task[0] for task in tasks]
+
+    complete_task(first, tasks[0][0], {"summary": "stale"}, "stale.pdf")
+    assert get_job_tasks(job)[0]["status"] != DONE
+
+    complete_task(second, tasks[0][0], {"summary": "current"}, "current.pdf")
+    assert get_job_tasks(job)[0]["resume"] == {"summary": "current"}
+
+
+def test_heartbeat_renews_the_lease(job):
+    claim, tasks = claim_tasks("host:1", 2)
+    claimed_at = _claimed_at(tasks[0][0])
+
+    with lease_heartbeat(claim, [task[0] for task in tasks], interval=0.05):
+        time.sleep(0.2)
+
+    assert _claimed_at(tasks[0][0]) > claimed_at
+
+
+def test_generation_errors_are_retried_not_rendered(job, monkeypatch, tmp_path):
+    import gemini_resume
+
+    class BrokenModel:
+        model_name = "broken"
+
+        def generate_content(self, prompt):
+            raise ValueError("bad gateway")
+
+    monkeypatch.setattr(gemini_resume, "gemini_model", BrokenModel())
+    monkeypatch.setattr(gemini_resume, "resume_cache", gemini_resume.ResumeCache(path=str(tmp_path / "cache.db")))
+    claim, tasks = claim_tasks("host:1", 2)
+    resume_jobs.ResumeJobRunner(workers=0)._process(claim, tasks)
+
+    for task in get_job_tasks(job):
+        assert task["status"] == resume_jobs.PENDING
+        assert task["error"] == "bad gateway"
+        assert task["pdf_path"] is None
+
+
+
+def test_reused_pdfs_are_copied_outside_the_write_transaction(job, monkeypatch, tmp_path):
+    from gemini_resume import resume_fingerprint
+    from generate_pdf import get_pdf_backend
+
+    renderer = get_pdf_backend()
+    claim, tasks = claim_tasks("host:1", 2)
+    for task_id, _, position, name, row_data, prompt_fields, _ in tasks:
+        resume_data = {"summary": f"Resume of {name}"}
+        pdf_path = tmp_path / f"{position}.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4")
+        rendered = resume_jobs._render_job_resume(row_data, prompt_fields, resume_data)
+        complete_task(claim, task_id, resume_data, str(pdf_path), resume_fingerprint(prompt_fields),
+                      resume_jobs._render_fingerprint(name, rendered, renderer))
+
+    copied = []
+    copyfile = shutil.copyfile
+
+    def checked_copyfile(source, destination):
+        # Fails with "database is locked" if the submit still holds SQLite's write lock
+        other = sqlite3.connect(database.DB_FILE, timeout=0)
+        other.execute("BEGIN IMMEDIATE")
+        other.rollback()
+        other.close()
+        copied.append(destination)
+        return copyfile(source, destination)
+
+    monkeypatch.setattr(resume_jobs.shutil, "copyfile", checked_copyfile)
+    rerun = submit_resume_job("tester", [(task[2], task[4], task[5]) for task in tasks])
+
+    assert len(copied) == 2
+    assert [task["status"] for task in get_job_tasks(rerun)] == [DONE, DONE]
+    assert resume_jobs.get_job(rerun)["status"] == resume_jobs.JOB_RUNNING
@@ -0,0 +1,94 @@
+import hashlib
+import json
+import math
+import os
+import threading
+
+import numpy as np
+from faker import Faker
+
+# ------------------------
+# Pre-generated Value Pools
+# ------------------------
+# The slowest Faker providers are generated once per provider and locale,
+# cached on disk, and then sampled with NumPy indexing. Pools are built from a
+# fixed seed, so a larger pool always starts with the values of a smaller one.
+
+POOL_CACHE_DIR = os.path.join("output", "cache", "pools")
+POOLED_PROVIDERS = ("name", "email", "address", "company", "job")
+MAX_POOL_SIZE = 200_000
+
+_pools = {}
+_lock = threading.Lock()
+
+
+def pool_size_for(num_rows, uniqueness):
+    # uniqueness is the share of distinct values wanted per provider column
+    if not 0 < uniqueness <= 1:
+        raise ValueError("uniqueness must be in (0, 1]")
+    return max(1, min(MAX_POOL_SIZE, math.ceil(num_rows * uniqueness)))
+
+
+def _pool_seed(provider, locale):
+    digest = hashlib.sha256(f"{provider}:{locale}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def _cache_path(provider, locale):
+    return os.path.join(POOL_CACHE_DIR, f"{provider}_{locale}.json")
+
+
+def _read_cache(provider, locale):
+    try:
+        with open(_cache_path(provider, locale), encoding="utf-8") as f:
+            return np.array(json.load(f), dtype=object)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(provider, locale, pool):
+    os.makedirs(POOL_CACHE_DIR, exist_ok=True)
+    path = _cache_path(provider, locale)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(pool.tolist(), f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _build_pool(provider, locale, size):
+    faker = Faker(locale)
+    faker.seed_instance(_pool_seed(provider, locale))
+    method = getattr(faker, provider)
+    return np.array([method() for _ in range(size)], dtype=object)
+
+
+def get_value_pool(provider, size, locale="en_US"):
+    key = (provider, locale)
+    with _lock:
+        pool = _pools.get(key)
+        if pool is None or len(pool) < size:
+            pool = _read_cache(provider, locale)
+            if pool is None or len(pool) < size:
+                pool = _build_pool(provider, locale, size)
+                _write_cache(provider, locale, pool)
+            _pools[key] = pool
+        return pool[:size]
+
+
+class PooledFaker:
+    """Faker wrapper whose expensive providers are sampled from cached pools."""
+
+    def __init__(self, faker, rng, pool_size):
+        self._faker = faker
+        self._rng = rng
+        self.pool_size = pool_size
+        self.locale = str(faker.locales[0])
+
+    def __getattr__(self, name):
+        return getattr(self._faker, name)
+
+    def sample_column(self, provider, size):
+        if provider not in POOLED_PROVIDERS:
+            return None
+        pool = get_value_pool(provider, self.pool_size, self.locale)
+        return pool[self._rng.integers(0, len(pool), size=size)]